@@ -0,0 +1,48 @@
+"""
+Import time regression check: the menu must come up without the heavy dependencies.
+
+Runs `python -X importtime -c "import main"` and fails if any of FORBIDDEN shows up.
+
+    python benchmarks/import_check.py
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORBIDDEN = ["web3", "eth_abi", "eth_account", "ccxt", "cryptography"]
+
+
+def get_imports(code: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative)
+
+    return imports
+
+
+def main():
+    imports = get_imports("import main")
+
+    leaked = sorted({name for name in imports if name.split(".")[0] in FORBIDDEN})
+    total = imports.get("main", 0) / 1000
+
+    if leaked:
+        print(f"FAIL | import main took {total:.0f} ms and pulled in: {', '.join(leaked[:20])}")
+        sys.exit(1)
+
+    print(f"OK | import main took {total:.0f} ms without {', '.join(FORBIDDEN)}")
+
+
+if __name__ == "__main__":
+    main()
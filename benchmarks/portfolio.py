@@ -0,0 +1,121 @@
+"""
+Portfolio checker throughput benchmark.
+
+Scans WALLETS wallets x TOKENS tokens (plus the native balance) on one chain against a fake RPC
+that answers every multicall after RPC_LATENCY, and compares the hand-written aggregate3 codec
+with the generic ABI encoder on one batch.
+
+    python benchmarks/portfolio.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WALLETS = 5000
+TOKENS = 8
+RPC_LATENCY = 0.2  # Second
+
+
+class FakeEth:
+    def __init__(self, response) -> None:
+        self.response = response
+        self.calls = 0
+
+    async def call(self, transaction):
+        self.calls += 1
+        await asyncio.sleep(RPC_LATENCY)
+
+        return self.response(transaction["data"])
+
+
+class FakeWeb3:
+    def __init__(self, response) -> None:
+        self.eth = FakeEth(response)
+
+    @staticmethod
+    def to_checksum_address(address):
+        from web3 import AsyncWeb3
+
+        return AsyncWeb3.to_checksum_address(address)
+
+
+def encode_results(count: int) -> bytes:
+    from eth_abi import encode
+
+    return encode(["(bool,bytes)[]"], [[(True, (10 ** 18).to_bytes(32, "big"))] * count])
+
+
+def measure_codec(addresses, tokens):
+    from eth_abi import encode, decode
+    from modules.portfolio import encode_address_call, BALANCE_OF_SELECTOR
+    from utils.multicall import encode_aggregate3, decode_aggregate3, to_bytes
+
+    calls = [
+        (token_address, encode_address_call(BALANCE_OF_SELECTOR, address))
+        for address in addresses for token_address in tokens.values()
+    ]
+    response = encode_results(len(calls))
+
+    start_time = time.perf_counter()
+    encode_aggregate3(calls, True)
+    decode_aggregate3(response)
+    manual = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    encode(["(address,bool,bytes)[]"], [[(target, True, to_bytes(data)) for target, data in calls]])
+    decode(["(bool,bytes)[]"], response)
+    generic = time.perf_counter() - start_time
+
+    return len(calls), manual * 1000, generic * 1000
+
+
+async def measure_scan(addresses, tokens):
+    from modules import portfolio
+    from settings import PORTFOLIO_BATCH_SIZE, PORTFOLIO_CONCURRENCY
+
+    responses = {}
+
+    def response(data):
+        count = int.from_bytes(data[36:68], "big")
+
+        if count not in responses:
+            responses[count] = encode_results(count)
+
+        return responses[count]
+
+    w3 = FakeWeb3(response)
+    semaphore = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+
+    start_time = time.perf_counter()
+    batches = await asyncio.gather(*[
+        portfolio.scan_batch(w3, "zksync", addresses[i:i + PORTFOLIO_BATCH_SIZE], tokens, semaphore)
+        for i in range(0, len(addresses), PORTFOLIO_BATCH_SIZE)
+    ])
+
+    return sum(len(batch) for batch in batches), w3.eth.calls, time.perf_counter() - start_time
+
+
+def main():
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    addresses = [f"0x{i:040x}" for i in range(1, WALLETS + 1)]
+    tokens = {f"TOKEN{i}": f"0x{0xdead0000 + i:040x}" for i in range(TOKENS)}
+
+    from settings import PORTFOLIO_BATCH_SIZE
+
+    calls, manual, generic = measure_codec(addresses[:PORTFOLIO_BATCH_SIZE], tokens)
+    print(f"aggregate3 codec, {calls} calls: hand-written {manual:.1f} ms, generic {generic:.1f} ms")
+
+    wallets, requests, elapsed = asyncio.run(measure_scan(addresses, tokens))
+    print(
+        f"scan {wallets} wallets x {TOKENS + 1} balances: {requests} requests, {elapsed:.2f} s. "
+        f"with {RPC_LATENCY * 1000:.0f} ms RPC latency"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Startup and module construction benchmark.
+
+Compares lazy ABI loading with loading every ABI up front (the old behaviour) and
+SyncSwap construction with and without the contract cache.
+
+    python benchmarks/startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_RUNS = 10
+CONSTRUCT_RUNS = 1000
+
+PRIVATE_KEY = "0x" + "11" * 32
+
+
+def measure_import(code: str) -> float:
+    timings = []
+
+    for _ in range(IMPORT_RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", f"import time; t = time.perf_counter(); {code}; print(time.perf_counter() - t)"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+
+    return statistics.median(timings) * 1000
+
+
+def measure_construct(clear_cache: bool) -> float:
+    from modules.syncswap import SyncSwap
+    from modules.account import Account
+
+    start_time = time.perf_counter()
+
+    for _ in range(CONSTRUCT_RUNS):
+        if clear_cache:
+            Account._contracts.clear()
+
+        SyncSwap(1, PRIVATE_KEY, None)
+
+    return (time.perf_counter() - start_time) / CONSTRUCT_RUNS * 1000
+
+
+def main():
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    print(f"import config, eager ABIs:  {measure_import('import config; config.load_all_abis()'):.2f} ms")
+    print(f"import config, lazy ABIs:   {measure_import('import config'):.2f} ms")
+
+    print(f"SyncSwap(), no cache:       {measure_construct(clear_cache=True):.3f} ms")
+    print(f"SyncSwap(), contract cache: {measure_construct(clear_cache=False):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
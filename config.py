@@ -1,4 +1,5 @@
 import json
+import threading
 from pathlib import Path
 
 OKX_API_INFO = {
@@ -13,120 +14,55 @@ PRIVATE_KEYS_PATH = 'private_keys.txt'
 ENCRYPTED_DATA_PATH = 'encrypted_data.txt'
 PROXIES_PATH = 'proxy.txt'
 REALTIME_SETTINGS_PATH = "realtime_settings.json"
+PASSWORD_ENV = "ZKSYNC_WALLETS_PASSWORD"  # password for headless runs, asked interactively if not set
+TOKEN_METADATA_PATH = "data/cache/token_metadata.json"
+POOL_CACHE_PATH = "data/cache/pools.json"
+TASK_STORE_PATH = "data/state/tasks.sqlite3"
+COMPLETION_JOURNAL_PATH = "data/state/completed.log"
 
 with open('data/rpc.json') as file:
     RPC = json.load(file)
 
-with open('data/abi/erc20_abi.json') as file:
-    ERC20_ABI = json.load(file)
-
-with open('data/abi/zksync/deposit.json') as file:
-    ZKSYNC_DEPOSIT_ABI = json.load(file)
-
-with open('data/abi/zksync/withdraw.json') as file:
-    ZKSYNC_WITHDRAW_ABI = json.load(file)
-
-with open('data/abi/zksync/weth.json') as file:
-    WETH_ABI = json.load(file)
-
-with open("data/abi/syncswap/router.json", "r") as file:
-    SYNCSWAP_ROUTER_ABI = json.load(file)
-
-with open('data/abi/syncswap/classic_pool.json') as file:
-    SYNCSWAP_CLASSIC_POOL_ABI = json.load(file)
-
-with open('data/abi/syncswap/classic_pool_data.json') as file:
-    SYNCSWAP_CLASSIC_POOL_DATA_ABI = json.load(file)
-
-with open("data/abi/mute/router.json", "r") as file:
-    MUTE_ROUTER_ABI = json.load(file)
-
-with open("data/abi/spacefi/router.json", "r") as file:
-    SPACEFI_ROUTER_ABI = json.load(file)
-
-with open("data/abi/pancake/router.json", "r") as file:
-    PANCAKE_ROUTER_ABI = json.load(file)
-
-with open("data/abi/pancake/factory.json", "r") as file:
-    PANCAKE_FACTORY_ABI = json.load(file)
-
-with open("data/abi/pancake/quoter.json", "r") as file:
-    PANCAKE_QUOTER_ABI = json.load(file)
-
-with open("data/abi/woofi/router.json", "r") as file:
-    WOOFI_ROUTER_ABI = json.load(file)
-
-with open("data/abi/zkswap/router.json", "r") as file:
-    ZKSWAP_ROUTER_ABI = json.load(file)
-
-with open("data/abi/maverick/position.json", "r") as file:
-    MAVERICK_POSITION_ABI = json.load(file)
-
-with open("data/abi/maverick/router.json", "r") as file:
-    MAVERICK_ROUTER_ABI = json.load(file)
-
-with open("data/abi/vesync/router.json", "r") as file:
-    VESYNC_ROUTER_ABI = json.load(file)
-
-with open("data/abi/bungee/abi.json", "r") as file:
-    BUNGEE_ABI = json.load(file)
-
-with open("data/abi/stargate/router.json", "r") as file:
-    STARGATE_ABI = json.load(file)
-
-with open("data/abi/eralend/abi.json", "r") as file:
-    ERALEND_ABI = json.load(file)
-
-with open("data/abi/basilisk/abi.json", "r") as file:
-    BASILISK_ABI = json.load(file)
-
-with open("data/abi/reactorfusion/abi.json", "r") as file:
-    REACTORFUSION_ABI = json.load(file)
-
-with open("data/abi/zerolend/abi.json", "r") as file:
-    ZEROLEND_ABI = json.load(file)
-
-with open("data/abi/dmail/abi.json", "r") as file:
-    DMAIL_ABI = json.load(file)
-
-with open("data/abi/l2telegraph/send_message.json", "r") as file:
-    L2TELEGRAPH_MESSAGE_ABI = json.load(file)
-
-with open("data/abi/l2telegraph/bridge_nft.json", "r") as file:
-    L2TELEGRAPH_NFT_ABI = json.load(file)
-
-with open("data/abi/nft2me/abi.json", "r") as file:
-    MINTER_ABI = json.load(file)
-
-with open("data/abi/mailzero/abi.json", "r") as file:
-    MAILZERO_ABI = json.load(file)
-
-with open("data/abi/tavaera/id.json", "r") as file:
-    TAVAERA_ID_ABI = json.load(file)
-
-with open("data/abi/tavaera/abi.json", "r") as file:
-    TAVAERA_ABI = json.load(file)
-
-with open("data/abi/zks/abi.json", "r") as file:
-    ZKS_ABI = json.load(file)
-
-with open("data/abi/era_ns/abi.json", "r") as file:
-    ENS_ABI = json.load(file)
-
-with open("data/abi/omnisea/abi.json", "r") as file:
-    OMNISEA_ABI = json.load(file)
-
-with open("data/abi/gnosis/abi.json", "r") as file:
-    SAFE_ABI = json.load(file)
-
-with open("data/abi/zkstars/abi.json", "r") as file:
-    ZKSTARS_ABI = json.load(file)
-
-with open("data/abi/owlto/abi.json", "r") as file:
-    OWLTO_CHECKIN_ABI = json.load(file)
-
-with open('data/orbiter_maker.json', 'r') as file:
-    ORBITER_MAKER = json.load(file)
+# ABIs and other large JSON data are read from disk on first access, see __getattr__ below
+LAZY_JSON_PATHS = {
+    "ERC20_ABI": "data/abi/erc20_abi.json",
+    "ZKSYNC_DEPOSIT_ABI": "data/abi/zksync/deposit.json",
+    "ZKSYNC_WITHDRAW_ABI": "data/abi/zksync/withdraw.json",
+    "WETH_ABI": "data/abi/zksync/weth.json",
+    "SYNCSWAP_ROUTER_ABI": "data/abi/syncswap/router.json",
+    "SYNCSWAP_CLASSIC_POOL_ABI": "data/abi/syncswap/classic_pool.json",
+    "SYNCSWAP_CLASSIC_POOL_DATA_ABI": "data/abi/syncswap/classic_pool_data.json",
+    "MUTE_ROUTER_ABI": "data/abi/mute/router.json",
+    "SPACEFI_ROUTER_ABI": "data/abi/spacefi/router.json",
+    "PANCAKE_ROUTER_ABI": "data/abi/pancake/router.json",
+    "PANCAKE_FACTORY_ABI": "data/abi/pancake/factory.json",
+    "PANCAKE_QUOTER_ABI": "data/abi/pancake/quoter.json",
+    "WOOFI_ROUTER_ABI": "data/abi/woofi/router.json",
+    "ZKSWAP_ROUTER_ABI": "data/abi/zkswap/router.json",
+    "MAVERICK_POSITION_ABI": "data/abi/maverick/position.json",
+    "MAVERICK_ROUTER_ABI": "data/abi/maverick/router.json",
+    "VESYNC_ROUTER_ABI": "data/abi/vesync/router.json",
+    "BUNGEE_ABI": "data/abi/bungee/abi.json",
+    "STARGATE_ABI": "data/abi/stargate/router.json",
+    "ERALEND_ABI": "data/abi/eralend/abi.json",
+    "BASILISK_ABI": "data/abi/basilisk/abi.json",
+    "REACTORFUSION_ABI": "data/abi/reactorfusion/abi.json",
+    "ZEROLEND_ABI": "data/abi/zerolend/abi.json",
+    "DMAIL_ABI": "data/abi/dmail/abi.json",
+    "L2TELEGRAPH_MESSAGE_ABI": "data/abi/l2telegraph/send_message.json",
+    "L2TELEGRAPH_NFT_ABI": "data/abi/l2telegraph/bridge_nft.json",
+    "MINTER_ABI": "data/abi/nft2me/abi.json",
+    "MAILZERO_ABI": "data/abi/mailzero/abi.json",
+    "TAVAERA_ID_ABI": "data/abi/tavaera/id.json",
+    "TAVAERA_ABI": "data/abi/tavaera/abi.json",
+    "ZKS_ABI": "data/abi/zks/abi.json",
+    "ENS_ABI": "data/abi/era_ns/abi.json",
+    "OMNISEA_ABI": "data/abi/omnisea/abi.json",
+    "SAFE_ABI": "data/abi/gnosis/abi.json",
+    "ZKSTARS_ABI": "data/abi/zkstars/abi.json",
+    "OWLTO_CHECKIN_ABI": "data/abi/owlto/abi.json",
+    "ORBITER_MAKER": "data/orbiter_maker.json",
+}
 
 ZKSYNC_BRIDGE_CONTRACT = "0x32400084c286cf3e17e7b677ea9583e60a000324"
 
@@ -249,6 +185,22 @@ SAFE_CONTRACT = "0xDAec33641865E4651fB43181C6DB6f7232Ee91c2"
 
 OWLTO_CHECKIN_CONTRACT = "0xD48e3caf0D948203434646a3f3e80f8Ee18007dc"
 
+MULTICALL_CONTRACTS = {
+    "ethereum": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "arbitrum": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "optimism": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "polygon_zkevm": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "zksync": "0xF9cda624FBC7e059355ce98a31693d299FACd963",
+    "base": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "scroll": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "linea": "0xcA11bde05977b3631167028862bE2a173976CA11",
+}
+
+# ERC-20 tokens scanned by the portfolio checker in addition to the native token of every chain
+PORTFOLIO_TOKENS = {
+    "zksync": {symbol: address for symbol, address in ZKSYNC_TOKENS.items() if symbol != "ETH"},
+}
+
 CHAINS_OKX = {
     'linea': 'Linea',
     'base': 'Base',
@@ -256,3 +208,25 @@ CHAINS_OKX = {
     'optimism': 'Optimism',
     'zksync': 'zkSync Era'
 }
+
+
+_lazy_json_lock = threading.Lock()
+
+
+def __getattr__(name):
+    path = LAZY_JSON_PATHS.get(name)
+
+    if path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _lazy_json_lock:
+        if name not in globals():
+            with open(path, "r") as file:
+                globals()[name] = json.load(file)
+
+    return globals()[name]
+
+
+def load_all_abis():
+    for name in LAZY_JSON_PATHS:
+        __getattr__(name)
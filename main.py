@@ -1,18 +1,29 @@
+import argparse
+import asyncio
+import functools
+import inspect
+import json
 import random
+import signal
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from itertools import count
+from pathlib import Path
+from typing import Callable, Dict, List, Union
 
 import questionary
 from loguru import logger
 from questionary import Choice
 
 from modules_settings import *
-from utils.helpers import remove_wallet
-from utils.sleeping import sleep
+from utils.disk_cache import token_metadata_cache
+from utils.journal import completion_journal
+from utils.realtime_settings import realtime_settings
+from utils.scheduler import Scheduler, current_scheduler
+from utils.sleeping import sleep, skip_sleeps, cancel_sleeps, start_wallet_timer, finish_wallet_timer, get_timers_summary
 from utils.logs_handler import filter_out_utils
-from utils.password_handler import get_wallet_data
 from settings import (
     USE_PROXY,
     RANDOM_WALLET,
@@ -20,7 +31,10 @@ from settings import (
     SLEEP_TO,
     QUANTITY_THREADS,
     THREAD_SLEEP_FROM,
-    THREAD_SLEEP_TO, REMOVE_WALLET
+    THREAD_SLEEP_TO, REMOVE_WALLET,
+    USE_ASYNC_SCHEDULER,
+    ASYNC_CONCURRENCY,
+    USE_GAS_CACHE
 )
 
 
@@ -84,6 +98,7 @@ def get_module():
             Choice(f"{next(counter)}) Use automatic routes", automatic_routes),
             Choice(f"{next(counter)}) MultiApprove", multi_approve),
             Choice(f"{next(counter)}) Check transaction count", "tx_checker"),
+            Choice(f"{next(counter)}) Check portfolio balances", "portfolio_checker"),
             Choice(f"{next(counter)}) Exit", "exit"),
         ],
         qmark="⚙️ ",
@@ -96,80 +111,381 @@ def get_module():
     return result
 
 
+def get_modules() -> Dict[str, Callable]:
+    import modules_settings
+
+    return {
+        name: func for name, func in vars(modules_settings).items()
+        if inspect.iscoroutinefunction(func) and func.__module__ == modules_settings.__name__
+    }
+
+
+def parse_wallet_ids(spec: Union[None, str, int, List]) -> Union[None, set]:
+    """
+    Wallet subset: None or "all" for every wallet, otherwise ids and ranges like "1-10,15" or [1, "3-5"]
+    """
+    if spec is None or spec == "all":
+        return None
+
+    parts = spec if isinstance(spec, list) else str(spec).split(",")
+
+    ids = set()
+    for part in parts:
+        part = str(part).strip()
+
+        if "-" in part:
+            start, end = part.split("-", 1)
+            ids.update(range(int(start), int(end) + 1))
+        elif part:
+            ids.add(int(part))
+
+    return ids
+
+
+def select_wallets(wallets: List[Dict], spec) -> List[Dict]:
+    ids = parse_wallet_ids(spec)
+
+    if ids is None:
+        return list(wallets)
+
+    return [wallet for wallet in wallets if wallet["id"] in ids]
+
+
+def get_job_module(name: str) -> Callable:
+    modules = get_modules()
+
+    if name not in modules:
+        raise ValueError(f"Unknown module {name}, see `python main.py list`")
+
+    return modules[name]
+
+
+def load_jobs(path: str) -> List[Dict]:
+    """
+    Job file (JSON or YAML): a list of {"module": ..., "wallets": ...} entries
+    or an object with such a list under "jobs". Module settings stay in modules_settings.py
+    """
+    path = Path(path)
+
+    with open(path, "r") as file:
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Install PyYAML to use YAML job files: pip install pyyaml")
+
+            data = yaml.safe_load(file)
+        else:
+            data = json.load(file)
+
+    jobs = data.get("jobs", []) if isinstance(data, dict) else data
+
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError(f"No jobs in {path}")
+
+    for job in jobs:
+        if not isinstance(job, dict) or "module" not in job:
+            raise ValueError(f"Job without module in {path}: {job}")
+
+        if "params" in job:
+            raise ValueError(f"Job params are not supported, set them in modules_settings.py: {job}")
+
+        job["func"] = get_job_module(job["module"])
+        parse_wallet_ids(job.get("wallets"))
+
+    return jobs
+
+
 def get_wallets():
+    from utils.password_handler import get_wallet_data
+
     wallet_data = get_wallet_data()
 
-    accounts, proxies = [], []
-    for wallet, data in wallet_data.items():
-        accounts.append(data['private_key'])
-        proxies.append(data['proxy'])
-    if USE_PROXY:
-        account_with_proxy = dict(zip(accounts, proxies))
-
-        wallets = [
-            {
-                "id": _id,
-                "key": key,
-                "proxy": account_with_proxy[key]
-            } for _id, key in enumerate(account_with_proxy, start=1)
-        ]
-    else:
-        wallets = [
-            {
-                "id": _id,
-                "key": key,
-                "proxy": None
-            } for _id, key in enumerate(accounts, start=1)
-        ]
+    wallets = [
+        {
+            "id": _id,
+            "address": address,
+            "key": data['private_key'],
+            "proxy": data['proxy'] if USE_PROXY else None
+        } for _id, (address, data) in enumerate(wallet_data.items(), start=1)
+    ]
     return wallets
 
 
-async def run_module(module, account_id, key, proxy):
+def get_module_name(module) -> str:
+    return getattr(module, "__name__", str(module))
+
+
+def skip_completed(module, wallets):
+    """
+    Drop the wallets the completion journal has already finished the module with
+    """
+    if not REMOVE_WALLET:
+        return wallets
+
+    completed = completion_journal.get_completed(get_module_name(module))
+    remaining = [wallet for wallet in wallets if wallet["address"] not in completed]
+
+    if len(remaining) != len(wallets):
+        logger.info(f"Skip {len(wallets) - len(remaining)} wallets that already finished {get_module_name(module)}")
+
+    return remaining
+
+
+def record_completion(module, address, status):
+    if REMOVE_WALLET and address is not None:
+        completion_journal.append(address, get_module_name(module), status)
+
+
+async def run_module(module, account_id, key, proxy, address=None):
+    from utils.helpers import failed_calls
+
+    timer = start_wallet_timer(account_id)
+    scheduler = current_scheduler.get()
+    # retry swallows the last error, the calls it gave up on count as a failed wallet
+    result = {"status": "success", "failed_calls": []}
+    failed_calls.set(result["failed_calls"])
+
+    if scheduler is not None:
+        # The module may continue on the scheduler (routes), the wallet is done when its last step is
+        scheduler.add_done_callback(functools.partial(finish_wallet, module, address, result, timer))
+
+        try:
+            await module(account_id, key, proxy)
+        except Exception as e:
+            logger.error(e)
+            result["status"] = "error"
+        return
+
     try:
-        await module(account_id, key, proxy)
-    except Exception as e:
-        logger.error(e)
+        try:
+            await module(account_id, key, proxy)
+        except Exception as e:
+            logger.error(e)
+            result["status"] = "error"
+
+        record_completion(module, address, get_wallet_status(result))
+
+        await sleep(realtime_settings.get("SLEEP_FROM", SLEEP_FROM), realtime_settings.get("SLEEP_TO", SLEEP_TO))
+    finally:
+        finish_wallet_timer(timer)
+
+
+def get_wallet_status(result) -> str:
+    return "error" if result["failed_calls"] else result["status"]
+
+
+def finish_wallet(module, address, result, timer):
+    record_completion(module, address, get_wallet_status(result))
+
+    finish_wallet_timer(timer)
+
+
+def log_timers_summary():
+    from utils.helpers import get_retry_stats
+    from utils.gas_estimates import gas_estimate_cache
+    from utils.rate_limiter import rate_limiter
+
+    wallets, worked, slept = get_timers_summary()
+
+    retry_stats = get_retry_stats()
+    if retry_stats:
+        logger.info(f"Retry stats: {retry_stats}")
 
-    if REMOVE_WALLET:
-        remove_wallet(key)
+    rate_limit_stats = rate_limiter.stats()
+    if rate_limit_stats:
+        logger.info(f"API rate limit stats: {rate_limit_stats}")
 
-    await sleep(SLEEP_FROM, SLEEP_TO)
+    if USE_GAS_CACHE:
+        logger.info(f"Gas estimate cache stats: {gas_estimate_cache.stats()}")
 
+    if wallets:
+        logger.info(
+            f"{wallets} wallets done | working {round(worked)} s., sleeping {round(slept)} s. in total"
+        )
 
-def _async_run_module(module, account_id, key, recipient):
-    asyncio.run(run_module(module, account_id, key, recipient))
 
+def get_thread_sleep():
+    return random.randint(
+        realtime_settings.get("THREAD_SLEEP_FROM", THREAD_SLEEP_FROM),
+        realtime_settings.get("THREAD_SLEEP_TO", THREAD_SLEEP_TO)
+    )
 
-def main(module):
+
+def handle_skip_signal(signum, frame):
+    threading.Thread(target=skip_sleeps, daemon=True).start()
+
+
+async def close_connections():
+    from utils.http_client import http_client
+    from utils.providers import provider_registry
+
+    await asyncio.gather(provider_registry.close(), http_client.close())
+
+
+async def _run_module_and_close(module, account_id, key, recipient, address=None):
+    try:
+        await run_module(module, account_id, key, recipient, address)
+    finally:
+        await close_connections()
+
+
+def _async_run_module(module, account_id, key, recipient, address=None):
+    asyncio.run(_run_module_and_close(module, account_id, key, recipient, address))
+
+
+async def run_wallets(module, wallets):
+    scheduler = Scheduler(lambda: realtime_settings.get("ASYNC_CONCURRENCY", ASYNC_CONCURRENCY))
+
+    loop = asyncio.get_running_loop()
+
+    def on_settings_change(_):
+        loop.call_soon_threadsafe(scheduler.wake)
+
+    realtime_settings.add_listener(on_settings_change)
+
+    run_at = time.time()
+    for _, account in enumerate(wallets, start=1):
+        scheduler.schedule(
+            run_at,
+            account.get("id"),
+            functools.partial(
+                run_module, module, account.get("id"), account.get("key"), account.get("proxy"), account.get("address")
+            )
+        )
+
+        if _ != len(wallets):
+            run_at += get_thread_sleep()
+
+    try:
+        await scheduler.run()
+    finally:
+        realtime_settings.remove_listener(on_settings_change)
+
+    logger.info(f"Scheduler stats: {scheduler.stats()}")
+
+
+async def run_jobs(jobs):
+    """
+    Run (module, wallets) jobs one after another on one event loop, sharing connections and caches
+    """
+    try:
+        for module, wallets in jobs:
+            logger.info(f"Run {get_module_name(module)} on {len(wallets)} wallets")
+
+            await run_wallets(module, wallets)
+    finally:
+        from utils.http_client import http_client
+        from utils.providers import provider_registry
+
+        logger.info(f"RPC pool stats: {provider_registry.stats()}")
+        logger.info(f"HTTP pool stats: {http_client.stats()}")
+        log_timers_summary()
+
+        await close_connections()
+
+
+def main(module, wallet_ids=None):
     if module == encrypt_privates:
         return encrypt_privates(force=True)
-    wallets = get_wallets()
+    wallets = skip_completed(module, select_wallets(get_wallets(), wallet_ids))
 
     if RANDOM_WALLET:
         random.shuffle(wallets)
 
+    if USE_ASYNC_SCHEDULER:
+        return asyncio.run(run_jobs([(module, wallets)]))
+
     with ThreadPoolExecutor(max_workers=QUANTITY_THREADS) as executor:
-        for _, account in enumerate(wallets, start=1):
-            executor.submit(
-                _async_run_module,
-                module,
-                account.get("id"),
-                account.get("key"),
-                account.get("proxy")
-            )
-            time.sleep(random.randint(THREAD_SLEEP_FROM, THREAD_SLEEP_TO))
+        try:
+            for _, account in enumerate(wallets, start=1):
+                executor.submit(
+                    _async_run_module,
+                    module,
+                    account.get("id"),
+                    account.get("key"),
+                    account.get("proxy"),
+                    account.get("address")
+                )
+                time.sleep(get_thread_sleep())
+
+            executor.shutdown(wait=True)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            cancel_sleeps()
+            raise
+
+    log_timers_summary()
+
+
+def run_job_file(path: str):
+    jobs = load_jobs(path)
+    wallets = get_wallets()
+
+    planned = []
+    for job in jobs:
+        job_wallets = skip_completed(job["func"], select_wallets(wallets, job.get("wallets")))
+
+        if RANDOM_WALLET:
+            random.shuffle(job_wallets)
+
+        planned.append((job["func"], job_wallets))
+
+    asyncio.run(run_jobs(planned))
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="zkSync wallets automation, run without arguments for the menu")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run one module from modules_settings.py")
+    run_parser.add_argument("module", help="module name, e.g. swap_syncswap")
+    run_parser.add_argument("--wallets", help="wallet ids, e.g. 1-10,15 (default: all)")
+
+    jobs_parser = commands.add_parser("jobs", help="run the jobs of a JSON/YAML file in one process")
+    jobs_parser.add_argument("file", help="job file, e.g. jobs.json")
+
+    commands.add_parser("list", help="list available modules")
+    commands.add_parser("tx-checker", help="check transaction count")
+    commands.add_parser("portfolio", help="check portfolio balances")
+    commands.add_parser("encrypt", help="encrypt private keys and proxies")
+
+    return parser
 
 
 if __name__ == '__main__':
+    args = get_parser().parse_args()
+
+    if args.command == "list":
+        print("\n".join(get_modules()))
+        sys.exit()
+
     print("❤️ Project author – https://t.me/sybilwave\n")
     print("❤️ Fork author – https://t.me/rgalyeon\n")
 
     logger.add('logs.txt', filter=filter_out_utils)
 
-    module = get_module()
-    if module == "tx_checker":
-        get_tx_count()
+    token_metadata_cache.load()
+    realtime_settings.start()
+
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, handle_skip_signal)
+
+    if args.command == "run":
+        main(get_job_module(args.module), args.wallets)
+    elif args.command == "jobs":
+        run_job_file(args.file)
+    elif args.command == "encrypt":
+        main(encrypt_privates)
     else:
-        main(module)
+        module = "tx_checker" if args.command == "tx-checker" else \
+            "portfolio_checker" if args.command == "portfolio" else get_module()
+
+        if module == "tx_checker":
+            get_tx_count()
+        elif module == "portfolio_checker":
+            get_portfolio()
+        else:
+            main(module)
 
     print("ALL DONE!")
@@ -1,39 +1,80 @@
-from .account import Account
-from .zksync import ZkSync
-from .orbiter import Orbiter
-from .syncswap import SyncSwap
-from .mute import Mute
-from .spacefi import SpaceFi
-from .pancake import Pancake
-from .woofi import WooFi
-from .odos import Odos
-from .zkswap import ZKSwap
-from .xyswap import XYSwap
-from .openocean import OpenOcean
-from .inch import Inch
-from .maverick import Maverick
-from .vesync import VeSync
-from .multiswap import Multiswap
-from .dmail import Dmail
-from .bungee import Bungee
-from .stargate import Stargate
-from .eralend import Eralend
-from .basilisk import Basilisk
-from .reactorfusion import ReactorFusion
-from .zerolend import ZeroLend
-from .l2telegraph import L2Telegraph
-from .minter import Minter
-from .mailzero import MailZero
-from .tavaera import Tavaera
-from .routes import Routes
-from .tx_checker import check_tx
-from .multi_approve import MultiApprove
-from .zks_domain import ZKSDomain
-from .era_domain import EraDomain
-from .omnisea import Omnisea
-from .swap_tokens import SwapTokens
-from .safe import GnosisSafe
-from .zkstars import ZkStars
-from .okx import Okx
-from .encrypt_privates import encrypt_privates
-from .owlto import Owlto
+import importlib
+
+# Public name -> submodule. The submodule (and web3, eth_abi, ccxt behind it) is imported
+# only when the name is used for the first time, so the menu starts without them
+EXPORTS = {
+    "Account": "account",
+    "ZkSync": "zksync",
+    "Orbiter": "orbiter",
+    "SyncSwap": "syncswap",
+    "Mute": "mute",
+    "SpaceFi": "spacefi",
+    "Pancake": "pancake",
+    "WooFi": "woofi",
+    "Odos": "odos",
+    "ZKSwap": "zkswap",
+    "XYSwap": "xyswap",
+    "OpenOcean": "openocean",
+    "Inch": "inch",
+    "Maverick": "maverick",
+    "VeSync": "vesync",
+    "Multiswap": "multiswap",
+    "Dmail": "dmail",
+    "Bungee": "bungee",
+    "Stargate": "stargate",
+    "Eralend": "eralend",
+    "Basilisk": "basilisk",
+    "ReactorFusion": "reactorfusion",
+    "ZeroLend": "zerolend",
+    "L2Telegraph": "l2telegraph",
+    "Minter": "minter",
+    "MailZero": "mailzero",
+    "Tavaera": "tavaera",
+    "Routes": "routes",
+    "check_tx": "tx_checker",
+    "check_portfolio": "portfolio",
+    "MultiApprove": "multi_approve",
+    "ZKSDomain": "zks_domain",
+    "EraDomain": "era_domain",
+    "Omnisea": "omnisea",
+    "SwapTokens": "swap_tokens",
+    "GnosisSafe": "safe",
+    "ZkStars": "zkstars",
+    "Okx": "okx",
+    "encrypt_privates": "encrypt_privates",
+    "Owlto": "owlto",
+}
+
+
+class LazyExport:
+    """
+    Stands in for a class or function of a submodule until it is called or one of its attributes is read
+    """
+
+    def __init__(self, name: str, module: str) -> None:
+        self._name = name
+        self._module = module
+        self._target = None
+
+    def resolve(self):
+        if self._target is None:
+            module = importlib.import_module(f".{self._module}", __name__)
+            self._target = getattr(module, self._name)
+
+            globals()[self._name] = self._target
+
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self.resolve(), item)
+
+    def __repr__(self) -> str:
+        return f"<lazy {__name__}.{self._module}.{self._name}>"
+
+
+globals().update({name: LazyExport(name, module) for name, module in EXPORTS.items()})
+
+__all__ = list(EXPORTS)
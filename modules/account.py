@@ -1,49 +1,97 @@
 import asyncio
+import threading
 import time
 import random
-from typing import Union, Dict
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Union, Dict, List, Tuple
 
 from loguru import logger
-from web3 import AsyncWeb3
 from eth_account import Account as EthereumAccount
 from web3.exceptions import TransactionNotFound
-from web3.middleware import async_geth_poa_middleware
 
-from config import RPC, ERC20_ABI, ZKSYNC_TOKENS
-from settings import GAS_MULTIPLIER
+from config import RPC, ERC20_ABI, ZKSYNC_TOKENS, ZERO_ADDRESS
+from settings import GAS_MULTIPLIER, PIPELINE_GAS_LIMIT, USE_GAS_CACHE
+from utils.nonce_manager import nonce_manager
+from utils.disk_cache import token_metadata_cache, pool_cache
+from utils.gas_estimates import gas_estimate_cache, GasKey
+from utils.multicall import multicall
+from utils.providers import provider_registry
+from utils.receipt_watcher import get_receipt_watcher, backoff, POLL_INTERVAL
 from utils.sleeping import sleep
+from utils.task_store import record_tx_hash
+
+CONTRACT_CACHE_SIZE = 4096
+POOL_MISS_TTL = 600  # Second, a pair without a pool is asked again after it
 
 
 class Account:
+    _chain_ids: Dict[str, int] = {}
+
+    # (id(w3), address, id(abi)) -> (abi, contract), the abi is kept alive so its id can't be reused
+    _contracts: "OrderedDict[Tuple[int, str, int], Tuple[Any, Any]]" = OrderedDict()
+    _contracts_lock = threading.Lock()
+
     def __init__(self, account_id: int, private_key: str, chain: str, proxy: Union[None, str]) -> None:
         self.account_id = account_id
         self.private_key = private_key
         self.chain = chain
         self.explorer = RPC[chain]["explorer"]
         self.token = RPC[chain]["token"]
-        self.proxy = f"http://{proxy}"
+        self.proxy = f"http://{proxy}" if proxy else None
 
-        request_kwargs = {}
-        
-        if self.proxy:
-            request_kwargs = {"proxy": self.proxy}
-
-        self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(random.choice(RPC[chain]["rpc"])),
-            middlewares=[async_geth_poa_middleware],
-            request_kwargs=request_kwargs
-        )
+        self.w3 = provider_registry.get_w3(chain, self.proxy)
         self.account = EthereumAccount.from_key(private_key)
         self.address = self.account.address
 
+        self._signed_nonces: Dict[bytes, int] = {}
+        # Transactions signed with a cached gas limit, to catch the limit running out
+        self._cached_gas: Dict[Union[bytes, str], Tuple[GasKey, int]] = {}
+        # Sent but not awaited approves, the next transaction goes right after them
+        self._pipelined_txs: List[str] = []
+
+    async def get_chain_id(self) -> int:
+        chain_id = Account._chain_ids.get(self.chain)
+
+        if chain_id is None:
+            chain_id = await self.w3.eth.chain_id
+            Account._chain_ids[self.chain] = chain_id
+
+        return chain_id
+
+    async def get_nonce(self) -> int:
+        nonce = nonce_manager.get(self.chain, self.address)
+
+        if nonce is None:
+            pending_nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+            nonce = nonce_manager.sync(self.chain, self.address, pending_nonce)
+
+        return nonce
+
+    def reset_nonce(self):
+        nonce_manager.reset(self.chain, self.address)
+
     async def get_tx_data(self, value: int = 0):
+        chain_id, gas_price, nonce = await asyncio.gather(
+            self.get_chain_id(),
+            self.w3.eth.gas_price,
+            self.get_nonce(),
+        )
+
         tx = {
-            "chainId": await self.w3.eth.chain_id,
+            "chainId": chain_id,
             "from": self.address,
             "value": value,
-            "gasPrice": await self.w3.eth.gas_price,
-            "nonce": await self.w3.eth.get_transaction_count(self.address),
+            "gasPrice": gas_price,
+            "nonce": nonce,
         }
+
+        if self._pipelined_txs:
+            # Estimation reverts until the pipelined approve is mined, build_transaction and sign skip it
+            tx["gas"] = PIPELINE_GAS_LIMIT[self.chain]
+        elif USE_GAS_CACHE:
+            # Placeholder, so build_transaction doesn't estimate: sign sets the limit from the cache or an estimate
+            tx["gas"] = 0
+
         return tx
 
     def get_contract(self, contract_address: str, abi=None):
@@ -52,21 +100,71 @@ class Account:
         if abi is None:
             abi = ERC20_ABI
 
+        key = (id(self.w3), contract_address, id(abi))
+
+        with Account._contracts_lock:
+            cached = Account._contracts.get(key)
+
+            if cached is not None and cached[0] is abi:
+                Account._contracts.move_to_end(key)
+                return cached[1]
+
         contract = self.w3.eth.contract(address=contract_address, abi=abi)
 
+        with Account._contracts_lock:
+            Account._contracts[key] = (abi, contract)
+
+            if len(Account._contracts) > CONTRACT_CACHE_SIZE:
+                Account._contracts.popitem(last=False)
+
         return contract
 
+    async def multicall(self, calls: List, allow_failure: bool = False) -> List:
+        return await multicall(self.w3, self.chain, calls, allow_failure)
+
     async def get_balance(self, contract_address: str) -> Dict:
-        contract_address = self.w3.to_checksum_address(contract_address)
-        contract = self.get_contract(contract_address)
+        balances = await self.get_balances([contract_address])
+
+        return balances[self.w3.to_checksum_address(contract_address)]
+
+    async def get_balances(self, contract_addresses: List[str]) -> Dict[str, Dict]:
+        contract_addresses = [self.w3.to_checksum_address(address) for address in contract_addresses]
+
+        metadata = {
+            address: token_metadata_cache.get(f"{self.chain}:{address.lower()}") for address in contract_addresses
+        }
+        missing = [address for address in contract_addresses if metadata[address] is None]
+
+        calls = []
+        for contract_address in missing:
+            contract = self.get_contract(contract_address)
+            calls.extend([contract.functions.symbol(), contract.functions.decimals()])
+        for contract_address in contract_addresses:
+            calls.append(self.get_contract(contract_address).functions.balanceOf(self.address))
+
+        results = await self.multicall(calls)
 
-        symbol = await contract.functions.symbol().call()
-        decimal = await contract.functions.decimals().call()
-        balance_wei = await contract.functions.balanceOf(self.address).call()
+        new_metadata = {}
+        for i, contract_address in enumerate(missing):
+            symbol, decimal = results[i * 2:i * 2 + 2]
 
-        balance = balance_wei / 10 ** decimal
+            metadata[contract_address] = {"symbol": symbol, "decimals": decimal}
+            new_metadata[f"{self.chain}:{contract_address.lower()}"] = metadata[contract_address]
 
-        return {"balance_wei": balance_wei, "balance": balance, "symbol": symbol, "decimal": decimal}
+        token_metadata_cache.update(new_metadata)
+
+        balances = {}
+        for contract_address, balance_wei in zip(contract_addresses, results[len(missing) * 2:]):
+            symbol = metadata[contract_address]["symbol"]
+            decimal = metadata[contract_address]["decimals"]
+
+            balance = balance_wei / 10 ** decimal
+
+            balances[contract_address] = {
+                "balance_wei": balance_wei, "balance": balance, "symbol": symbol, "decimal": decimal
+            }
+
+        return balances
 
     async def get_amount(
             self,
@@ -95,6 +193,24 @@ class Account:
 
         return amount_wei, amount, balance
 
+    async def get_cached_pool(
+            self, factory: str, from_token: str, to_token: str, get_pool: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Pool of the pair from the persistent pool cache shared by all wallets and runs, get_pool asks the factory
+        """
+        key = ":".join([self.chain, factory.lower(), *sorted([from_token.lower(), to_token.lower()])])
+
+        cached = pool_cache.get(key)
+        if cached is not None:
+            if cached["pool"] != ZERO_ADDRESS or time.time() - cached["checked_at"] < POOL_MISS_TTL:
+                return cached["pool"]
+
+        pool = await get_pool()
+        pool_cache.update({key: {"pool": pool, "checked_at": int(time.time())}})
+
+        return pool
+
     async def check_allowance(self, token_address: str, contract_address: str) -> float:
         token_address = self.w3.to_checksum_address(token_address)
         contract_address = self.w3.to_checksum_address(contract_address)
@@ -104,13 +220,42 @@ class Account:
 
         return amount_approved
 
-    async def approve(self, amount: int, token_address: str, contract_address: str):
+    async def check_allowances(self, pairs: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """
+        Read allowances of many (token_address, contract_address) pairs in one call
+        """
+        pairs = [
+            (self.w3.to_checksum_address(token_address), self.w3.to_checksum_address(contract_address))
+            for token_address, contract_address in pairs
+        ]
+
+        results = await self.multicall([
+            self.get_contract(token_address).functions.allowance(self.address, contract_address)
+            for token_address, contract_address in pairs
+        ])
+
+        return dict(zip(pairs, results))
+
+    async def approve(
+            self,
+            amount: int,
+            token_address: str,
+            contract_address: str,
+            allowance_amount: int = None,
+            pipeline: bool = False
+    ) -> Union[None, str]:
+        """
+        With pipeline the approve is sent without waiting for its receipt: the next transaction
+        gets the following nonce and the PIPELINE_GAS_LIMIT of the chain, and wait_until_tx_finished
+        waits for both. Chains without a PIPELINE_GAS_LIMIT wait for the approve as usual.
+        """
         token_address = self.w3.to_checksum_address(token_address)
         contract_address = self.w3.to_checksum_address(contract_address)
 
         contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
 
-        allowance_amount = await self.check_allowance(token_address, contract_address)
+        if allowance_amount is None:
+            allowance_amount = await self.check_allowance(token_address, contract_address)
 
         if amount > allowance_amount or amount == 0:
             logger.success(f"[{self.account_id}][{self.address}] Make approve")
@@ -128,41 +273,162 @@ class Account:
 
             txn_hash = await self.send_raw_transaction(signed_txn)
 
+            if pipeline and self.chain in PIPELINE_GAS_LIMIT:
+                self._pipelined_txs.append(txn_hash.hex())
+                return txn_hash.hex()
+
             await self.wait_until_tx_finished(txn_hash.hex())
 
             await sleep(5, 20)
 
     async def wait_until_tx_finished(self, hash: str, max_wait_time=180):
+        if self._pipelined_txs:
+            hashes, self._pipelined_txs = self._pipelined_txs + [hash], []
+
+            results = await asyncio.gather(*(self.wait_until_receipt(tx_hash, max_wait_time) for tx_hash in hashes))
+
+            return all(results)
+
+        return await self.wait_until_receipt(hash, max_wait_time)
+
+    async def settle_pipelined_txs(self):
+        """
+        Wait for the pipelined approves of a sequence that failed before wait_until_tx_finished,
+        so a retry starts with their allowance set and estimates its gas again
+        """
+        hashes, self._pipelined_txs = self._pipelined_txs, []
+
+        if hashes:
+            await asyncio.gather(*(self.wait_until_receipt(tx_hash) for tx_hash in hashes), return_exceptions=True)
+
+    async def wait_until_receipt(self, hash: str, max_wait_time=180):
         start_time = time.time()
-        while True:
-            try:
-                receipts = await self.w3.eth.get_transaction_receipt(hash)
-                status = receipts.get("status")
-                if status == 1:
-                    logger.success(f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!")
-                    return True
-                elif status is None:
-                    await asyncio.sleep(0.3)
+
+        watcher = get_receipt_watcher(self.chain, self.proxy)
+        in_block = watcher.watch(hash)
+
+        delay = POLL_INTERVAL
+        block_checked = False
+        try:
+            while True:
+                if block_checked:
+                    await asyncio.sleep(delay)
                 else:
-                    logger.error(f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!")
-                    return False
-            except TransactionNotFound:
-                if time.time() - start_time > max_wait_time:
-                    print(f'FAILED TX: {hash}')
-                    return False
-                await asyncio.sleep(1)
+                    await asyncio.wait({in_block}, timeout=delay)
+                    block_checked = in_block.done()
+
+                try:
+                    receipts = await self.w3.eth.get_transaction_receipt(hash)
+                    status = receipts.get("status")
+                    if status == 1:
+                        logger.success(f"[{self.account_id}][{self.address}] {self.explorer}{hash} successfully!")
+                        return True
+                    elif status is not None:
+                        logger.error(f"[{self.account_id}][{self.address}] {self.explorer}{hash} transaction failed!")
+                        self.check_out_of_gas(hash, receipts)
+                        return False
+                except TransactionNotFound:
+                    if time.time() - start_time > max_wait_time:
+                        print(f'FAILED TX: {hash}')
+                        self.reset_nonce()
+                        return False
+
+                delay = backoff(delay)
+        finally:
+            watcher.unwatch(hash)
+            self._cached_gas.pop(hash, None)
+
+    def check_out_of_gas(self, hash: str, receipt):
+        cached = self._cached_gas.pop(hash, None)
+
+        if cached is not None and receipt.get("gasUsed", 0) >= cached[1] * 0.95:
+            logger.warning(f"[{self.account_id}][{self.address}] Cached gas limit {cached[1]} ran out, estimate again")
+            gas_estimate_cache.record_out_of_gas(cached[0])
+
+    def get_gas_key(self, transaction) -> Union[None, GasKey]:
+        data = transaction.get("data") or ""
+        if isinstance(data, bytes):
+            data = "0x" + data.hex()
+
+        if not transaction.get("to") or len(data) < 10:
+            return None
+
+        return self.chain, transaction["to"].lower(), data[:10].lower()
+
+    async def get_gas_limit(self, transaction) -> Tuple[int, bool]:
+        """
+        Gas limit of the transaction and whether it came from the gas estimate cache
+        """
+        key = self.get_gas_key(transaction) if USE_GAS_CACHE else None
+
+        call = {k: v for k, v in transaction.items() if k != "gas"}
+
+        if key is not None:
+            gas = gas_estimate_cache.get(key)
+
+            if gas is not None:
+                # The estimate also caught reverts before sending, a single eth_call still does
+                await self.w3.eth.call(call)
+
+                return int(gas * GAS_MULTIPLIER), True
+
+        gas = await self.w3.eth.estimate_gas(call)
+
+        if key is not None:
+            gas_estimate_cache.add(key, gas)
+
+        return int(gas * GAS_MULTIPLIER), False
+
+    def release_unsent(self):
+        """
+        Forget transactions that were signed but never sent. Their nonces were never committed,
+        the local nonce is synced again so the next transaction gets the right one
+        """
+        if not self._signed_nonces:
+            return
+
+        for signed_hash in self._signed_nonces:
+            self._cached_gas.pop(signed_hash, None)
+
+        self._signed_nonces.clear()
+        self.reset_nonce()
 
     async def sign(self, transaction):
-        gas = await self.w3.eth.estimate_gas(transaction)
-        gas = int(gas * GAS_MULTIPLIER)
+        # Every transaction is sent right after it is signed, an earlier one still here was abandoned
+        self.release_unsent()
+
+        cached = False
+
+        if not self._pipelined_txs:
+            gas, cached = await self.get_gas_limit(transaction)
 
-        transaction.update({"gas": gas})
+            transaction.update({"gas": gas})
 
         signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
 
+        self._signed_nonces[signed_txn.hash] = transaction["nonce"]
+
+        if cached:
+            self._cached_gas[signed_txn.hash] = (self.get_gas_key(transaction), transaction["gas"])
+
         return signed_txn
 
     async def send_raw_transaction(self, signed_txn):
-        txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        nonce = self._signed_nonces.pop(signed_txn.hash, None)
+
+        try:
+            txn_hash = await self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            self.reset_nonce()
+            raise
+
+        if nonce is not None:
+            nonce_manager.commit(self.chain, self.address, nonce)
+
+        cached = self._cached_gas.pop(signed_txn.hash, None)
+        if cached is not None:
+            self._cached_gas[txn_hash.hex()] = cached
+
+        record_tx_hash(txn_hash, self.chain)
 
         return txn_hash
@@ -42,15 +42,11 @@ class Eralend(Account):
             max_percent
         )
 
-        tx = {
-            "chainId": await self.w3.eth.chain_id,
-            "from": self.address,
+        tx = await self.get_tx_data(amount_wei)
+        tx.update({
             "to": self.w3.to_checksum_address(ERALEND_CONTRACTS["landing"]),
-            "gasPrice": await self.w3.eth.gas_price,
-            "nonce": await self.w3.eth.get_transaction_count(self.address),
-            "value": amount_wei,
             "data": "0x1249c58b"
-        }
+        })
 
         logger.info(f"[{self.account_id}][{self.address}] Make deposit on Eralend | {amount} ETH")
 
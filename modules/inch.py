@@ -1,11 +1,12 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from config import INCH_CONTRACT, ZKSYNC_TOKENS
 from settings import INCH_API_KEY
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 from .account import Account
 
 
@@ -21,7 +22,7 @@ class Inch(Account):
             self.proxy = f"http://{proxy}"
 
     async def build_tx(self, from_token: str, to_token: str, amount: int, slippage: int):
-        url = f"https://api.1inch.dev/swap/v5.2/{await self.w3.eth.chain_id}/swap"
+        url = f"https://api.1inch.dev/swap/v5.2/{await self.get_chain_id()}/swap"
 
         params = {
             "src": self.w3.to_checksum_address(from_token),
@@ -37,9 +38,10 @@ class Inch(Account):
                 "fee": 1
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url, params=params, headers=self.headers, proxy=self.proxy)
+        await rate_limiter.acquire("inch", INCH_API_KEY)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.get(url, params=params, headers=self.headers, proxy=self.proxy) as response:
             transaction_data = await response.json()
 
             return transaction_data
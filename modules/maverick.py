@@ -3,6 +3,7 @@ from typing import Union, Dict
 
 from loguru import logger
 from config import MAVERICK_CONTRACTS, MAVERICK_POSITION_ABI, ZKSYNC_TOKENS, MAVERICK_ROUTER_ABI, ZERO_ADDRESS
+from settings import PIPELINE_APPROVE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
 from .account import Account
@@ -68,7 +69,7 @@ class Maverick(Account):
         return contract_txn
 
     async def swap_to_eth(self, from_token: str, to_token: str, amount: int, slippage: int):
-        await self.approve(amount, ZKSYNC_TOKENS[from_token], MAVERICK_CONTRACTS["router"])
+        await self.approve(amount, ZKSYNC_TOKENS[from_token], MAVERICK_CONTRACTS["router"], pipeline=PIPELINE_APPROVE)
 
         tx_data = await self.get_tx_data()
 
@@ -34,11 +34,23 @@ class MultiApprove(Account):
         random.shuffle(contract_list)
         random.shuffle(token_list)
 
+        allowances = await self.check_allowances([
+            (ZKSYNC_TOKENS[token], contract_address)
+            for contract_address in contract_list
+            for token in token_list
+            if token not in ["ETH", "WETH"]
+        ])
+
         for contract_address in contract_list:
             for _, token in enumerate(token_list):
                 if token in ["ETH", "WETH"]:
                     continue
 
-                await self.approve(amount, ZKSYNC_TOKENS[token], contract_address)
+                allowance_amount = allowances[(
+                    self.w3.to_checksum_address(ZKSYNC_TOKENS[token]),
+                    self.w3.to_checksum_address(contract_address)
+                )]
+
+                await self.approve(amount, ZKSYNC_TOKENS[token], contract_address, allowance_amount)
 
                 await sleep(sleep_from, sleep_to)
@@ -3,7 +3,21 @@ from typing import Union
 
 from loguru import logger
 from config import ZKSYNC_TOKENS
-from modules import *
+from settings import USE_BEST_QUOTE
+from .account import Account
+from .syncswap import SyncSwap
+from .mute import Mute
+from .spacefi import SpaceFi
+from .pancake import Pancake
+from .woofi import WooFi
+from .odos import Odos
+from .zkswap import ZKSwap
+from .xyswap import XYSwap
+from .openocean import OpenOcean
+from .inch import Inch
+from .maverick import Maverick
+from .vesync import VeSync
+from .quote_engine import get_best_swap_module
 from utils.sleeping import sleep
 
 
@@ -73,7 +87,13 @@ class Multiswap(Account):
                 min_amount = balance["balance"] if balance["balance"] <= 1 else balance["balance"] / 100 * min_percent
                 max_amount = balance["balance"] if balance["balance"] <= 1 else balance["balance"] / 100 * max_percent
 
-            swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.proxy)
+            if USE_BEST_QUOTE:
+                amount_wei = int((min_amount + max_amount) / 2 * 10 ** (18 if token == "ETH" else balance["decimal"]))
+                swap_module = await get_best_swap_module(self, self.swap_modules, use_dex, token, to_token, amount_wei)
+            else:
+                swap_module = self.get_swap_module(use_dex)
+
+            swap_module = swap_module(self.account_id, self.private_key, self.proxy)
             await swap_module.swap(
                 token,
                 to_token,
@@ -4,6 +4,7 @@ from typing import Union
 from loguru import logger
 
 from config import MUTE_ROUTER_ABI, MUTE_CONTRACTS, ZKSYNC_TOKENS
+from settings import PIPELINE_APPROVE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
 from .account import Account
@@ -46,7 +47,7 @@ class Mute(Account):
 
         from_token_stable = True if from_token == "USDC" else False
 
-        await self.approve(amount, token_address, MUTE_CONTRACTS["router"])
+        await self.approve(amount, token_address, MUTE_CONTRACTS["router"], pipeline=PIPELINE_APPROVE)
 
         tx_data = await self.get_tx_data()
         
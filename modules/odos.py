@@ -1,11 +1,11 @@
-import aiohttp
-
 from typing import Union, Dict
 from loguru import logger
 
 from config import ZERO_ADDRESS, ZKSYNC_TOKENS, ODOS_CONTRACT
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 from .account import Account
 
 
@@ -22,7 +22,7 @@ class Odos(Account):
         url = "https://api.odos.xyz/sor/quote/v2"
 
         data = {
-            "chainId": await self.w3.eth.chain_id,
+            "chainId": await self.get_chain_id(),
             "inputTokens": [
                 {
                     "tokenAddress": self.w3.to_checksum_address(from_token),
@@ -41,14 +41,15 @@ class Odos(Account):
             "compact": True
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-                proxy=self.proxy
-            )
+        await rate_limiter.acquire("odos", self.proxy)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.post(
+            url=url,
+            headers={"Content-Type": "application/json"},
+            json=data,
+            proxy=self.proxy
+        ) as response:
             if response.status == 200:
                 response_data = await response.json()
 
@@ -65,14 +66,15 @@ class Odos(Account):
             "simulate": False,
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-                proxy=self.proxy
-            )
+        await rate_limiter.acquire("odos", self.proxy)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.post(
+            url=url,
+            headers={"Content-Type": "application/json"},
+            json=data,
+            proxy=self.proxy
+        ) as response:
             if response.status == 200:
                 response_data = await response.json()
 
@@ -1,8 +1,8 @@
 import asyncio
-import aiohttp
+from aiohttp import ClientTimeout
 import traceback
 
-from . import ZkSync
+from .zksync import ZkSync
 from config import OKX_API_INFO, CHAINS_OKX
 from loguru import logger
 import random
@@ -11,6 +11,8 @@ import ccxt.async_support as ccxt_async
 import math
 import re
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 import datetime
 import base64
 import hmac
@@ -55,18 +57,20 @@ class Okx(ZkSync):
 
     @staticmethod
     async def make_http_request(url, method="GET", headers=None, params=None, data=None, timeout=10):
-        async with aiohttp.ClientSession() as session:
-            kwargs = {"url": url, "method": method, "timeout": timeout}
-
-            if headers:
-                kwargs["headers"] = headers
-            if params:
-                kwargs["params"] = params
-            if data:
-                kwargs["data"] = data
-
-            async with session.request(**kwargs) as response:
-                return await response.json()
+        kwargs = {"url": url, "method": method, "timeout": ClientTimeout(total=timeout)}
+
+        if headers:
+            kwargs["headers"] = headers
+        if params:
+            kwargs["params"] = params
+        if data:
+            kwargs["data"] = data
+
+        await rate_limiter.acquire("okx", headers.get("OK-ACCESS-KEY") if headers else None)
+        session = await http_client.get_session(url)
+
+        async with session.request(**kwargs) as response:
+            return await response.json()
 
     async def transfer_from_subaccounts(self, token_name):
 
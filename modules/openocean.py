@@ -1,10 +1,11 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from config import OPENOCEAN_CONTRACT, ZKSYNC_TOKENS
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 from .account import Account
 
 
@@ -35,9 +36,10 @@ class OpenOcean(Account):
                 "referrerFee": 1
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        await rate_limiter.acquire("openocean", self.proxy)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.get(url=url, params=params, proxy=self.proxy) as response:
             transaction_data = await response.json()
 
             return transaction_data
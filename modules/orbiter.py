@@ -1,26 +1,24 @@
+import asyncio
 import random
 from typing import Union
 
-import aiohttp
 from loguru import logger
 
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 from .account import Account
-from config import ORBITER_MAKER, RPC
+from config import ORBITER_MAKER
 from typing import List
-from web3 import AsyncWeb3, Web3
+from web3 import AsyncWeb3
 from eth_account import Account as EthereumAccount
+from utils.providers import provider_registry
 
 
 class Orbiter(Account):
-    def __init__(self, account_id: int,
-                 private_key: str,
-                 chains: List[str],
-                 proxy: Union[None, str],
-                 min_required_amount: float) -> None:
-        chains_with_balance = self.find_balance(chains, private_key, min_required_amount)
-        super().__init__(account_id=account_id, private_key=private_key, proxy=proxy, chain=chains_with_balance[0])
+    def __init__(self, account_id: int, private_key: str, chain: str, proxy: Union[None, str]) -> None:
+        super().__init__(account_id=account_id, private_key=private_key, proxy=proxy, chain=chain)
 
         self.chain_ids = {
             "ethereum": "1",
@@ -64,13 +62,14 @@ class Orbiter(Account):
             "params": [f"{self.chain_ids[from_chain]}-{self.chain_ids[to_chain]}:ETH-ETH", float(amount)]
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.post(
-                url=url,
-                headers={"Content-Type": "application/json"},
-                json=data,
-            )
+        await rate_limiter.acquire("orbiter")
+        session = await http_client.get_session(url)
 
+        async with session.post(
+            url=url,
+            headers={"Content-Type": "application/json"},
+            json=data,
+        ) as response:
             response_data = await response.json()
 
             if response_data.get("result").get("error", None) is None:
@@ -83,15 +82,33 @@ class Orbiter(Account):
 
                 return False
 
-    def find_balance(self, chains, private_key, min_required_amount):
+    @classmethod
+    async def create(cls, account_id: int,
+                     private_key: str,
+                     chains: List[str],
+                     proxy: Union[None, str],
+                     min_required_amount: float) -> "Orbiter":
+        chains_with_balance = await cls.find_balance(chains, private_key, proxy, min_required_amount)
+
+        return cls(account_id=account_id, private_key=private_key, chain=chains_with_balance[0], proxy=proxy)
+
+    @staticmethod
+    async def find_balance(chains, private_key, proxy, min_required_amount):
+        address = EthereumAccount.from_key(private_key).address
+        proxy = f"http://{proxy}" if proxy else None
+
+        balances = await asyncio.gather(
+            *[provider_registry.get_w3(chain, proxy).eth.get_balance(address) for chain in chains],
+            return_exceptions=True
+        )
+
         chains_with_balance = []
-        for chain in chains:
-            self.w3 = Web3(
-                Web3.HTTPProvider(random.choice(RPC[chain]["rpc"])),
-            )
-            account = EthereumAccount.from_key(private_key)
-            balance_wei = self.w3.eth.get_balance(self.w3.to_checksum_address(account.address))
-            balance = self.w3.from_wei(balance_wei, 'ether')
+        for chain, balance_wei in zip(chains, balances):
+            if isinstance(balance_wei, Exception):
+                logger.warning(f"[{address}] Can't get balance on {chain} | {balance_wei}")
+                continue
+
+            balance = AsyncWeb3.from_wei(balance_wei, 'ether')
             if balance >= min_required_amount:
                 chains_with_balance.append((chain, balance))
         if not chains_with_balance:
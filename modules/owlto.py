@@ -1,12 +1,12 @@
 import asyncio
 
-import aiohttp
 from typing import Union
 
 from loguru import logger
 from config import OWLTO_CHECKIN_CONTRACT, OWLTO_CHECKIN_ABI
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
 from .account import Account
 import time
 
@@ -59,13 +59,14 @@ class Owlto(Account):
         n_attempt = 3
         while n_attempt:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get("https://owlto.finance/api/lottery/maker/sign/in", params=params,
-                                           headers=headers, proxy=self.proxy) as response:
-                        response_data = await response.json()
-                        if response_data['message'] == 'success':
-                            logger.success(f"[{self.account_id}][{self.address}] Successfully check-in on site")
-                            break
+                url = "https://owlto.finance/api/lottery/maker/sign/in"
+                session = await http_client.get_session(url, self.proxy)
+
+                async with session.get(url, params=params, headers=headers, proxy=self.proxy) as response:
+                    response_data = await response.json()
+                    if response_data['message'] == 'success':
+                        logger.success(f"[{self.account_id}][{self.address}] Successfully check-in on site")
+                        break
                 await asyncio.sleep(20)
             except Exception as e:
                 logger.error(f'[{self.account_id}][{self.address}] Error in button check-in: {e}')
@@ -3,6 +3,7 @@ from typing import Union, Dict
 
 from loguru import logger
 
+from settings import PIPELINE_APPROVE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
 from .account import Account
@@ -26,11 +27,16 @@ class Pancake(Account):
     async def get_pool(self, from_token: str, to_token: str):
         factory = self.get_contract(PANCAKE_CONTRACTS["factory"], PANCAKE_FACTORY_ABI)
 
-        pool = await factory.functions.getPool(
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token]),
-            500
-        ).call()
+        pool = await self.get_cached_pool(
+            PANCAKE_CONTRACTS["factory"],
+            ZKSYNC_TOKENS[from_token],
+            ZKSYNC_TOKENS[to_token],
+            factory.functions.getPool(
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token]),
+                500
+            ).call
+        )
 
         return pool
 
@@ -74,7 +80,7 @@ class Pancake(Account):
         return contract_txn
 
     async def swap_to_eth(self, from_token: str, to_token: str, amount: int, slippage: int):
-        await self.approve(amount, ZKSYNC_TOKENS[from_token], PANCAKE_CONTRACTS["router"])
+        await self.approve(amount, ZKSYNC_TOKENS[from_token], PANCAKE_CONTRACTS["router"], pipeline=PIPELINE_APPROVE)
 
         tx_data = await self.get_tx_data()
 
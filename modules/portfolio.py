@@ -0,0 +1,169 @@
+import asyncio
+import csv
+import time
+from typing import Dict, List
+
+from eth_abi import decode
+from loguru import logger
+from web3 import AsyncWeb3
+
+from config import RPC, WALLETS_PATH, MULTICALL_CONTRACTS, PORTFOLIO_TOKENS
+from settings import PORTFOLIO_CONCURRENCY, PORTFOLIO_BATCH_SIZE
+from utils.disk_cache import token_metadata_cache
+from utils.multicall import aggregate
+from utils.providers import provider_registry
+
+GET_ETH_BALANCE_SELECTOR = AsyncWeb3.keccak(text="getEthBalance(address)")[:4].hex().removeprefix("0x")
+BALANCE_OF_SELECTOR = AsyncWeb3.keccak(text="balanceOf(address)")[:4].hex().removeprefix("0x")
+DECIMALS_SELECTOR = AsyncWeb3.keccak(text="decimals()")[:4].hex().removeprefix("0x")
+SYMBOL_SELECTOR = AsyncWeb3.keccak(text="symbol()")[:4].hex().removeprefix("0x")
+
+
+def encode_address_call(selector: str, address: str) -> str:
+    return f"0x{selector}{address[2:].lower().rjust(64, '0')}"
+
+
+def decode_uint(success: bool, data: bytes) -> int:
+    return int.from_bytes(data[:32], "big") if success and len(data) >= 32 else 0
+
+
+def get_addresses() -> List[str]:
+    with open(WALLETS_PATH, "r") as file:
+        return [AsyncWeb3.to_checksum_address(wallet) for wallet in file.read().split()]
+
+
+async def get_decimals(w3: AsyncWeb3, chain: str, tokens: Dict[str, str]) -> Dict[str, int]:
+    """
+    Decimals of the tokens, the ones decimals() failed for are left out.
+    Fetched symbols and decimals are saved to the token metadata cache
+    """
+    decimals = {}
+    missing = []
+
+    for symbol, token_address in tokens.items():
+        metadata = token_metadata_cache.get(f"{chain}:{token_address.lower()}")
+
+        if metadata is None:
+            missing.append(symbol)
+        else:
+            decimals[symbol] = metadata["decimals"]
+
+    calls = []
+    for symbol in missing:
+        calls.extend([(tokens[symbol], f"0x{SYMBOL_SELECTOR}"), (tokens[symbol], f"0x{DECIMALS_SELECTOR}")])
+
+    results = await aggregate(w3, chain, calls, allow_failure=True)
+
+    new_metadata = {}
+    for symbol, symbol_result, (success, data) in zip(missing, results[::2], results[1::2]):
+        if not success or len(data) < 32:
+            logger.error(f"Failed to get decimals of {symbol} on {chain}, its balances are left out")
+            continue
+
+        decimals[symbol] = decode_uint(success, data)
+
+        try:
+            token_symbol = decode(["string"], symbol_result[1])[0] if symbol_result[0] else None
+        except Exception:
+            token_symbol = None
+
+        # Tokens with a non-standard symbol() are not cached, they are fetched again next run
+        if token_symbol is not None:
+            new_metadata[f"{chain}:{tokens[symbol].lower()}"] = {"symbol": token_symbol, "decimals": decimals[symbol]}
+
+    token_metadata_cache.update(new_metadata)
+
+    return decimals
+
+
+async def scan_batch(w3: AsyncWeb3, chain: str, addresses: List[str], tokens: Dict[str, str], semaphore):
+    multicall_address = w3.to_checksum_address(MULTICALL_CONTRACTS[chain])
+
+    calls = []
+    for address in addresses:
+        calls.append((multicall_address, encode_address_call(GET_ETH_BALANCE_SELECTOR, address)))
+        calls.extend(
+            (token_address, encode_address_call(BALANCE_OF_SELECTOR, address)) for token_address in tokens.values()
+        )
+
+    async with semaphore:
+        results = await aggregate(w3, chain, calls, allow_failure=True)
+
+    step = len(tokens) + 1
+
+    return {
+        address: [decode_uint(*result) for result in results[i * step:(i + 1) * step]]
+        for i, address in enumerate(addresses)
+    }
+
+
+async def scan_chain(chain: str, addresses: List[str], semaphore) -> Dict[str, Dict[str, float]]:
+    w3 = provider_registry.get_w3(chain)
+
+    tokens = {
+        symbol: w3.to_checksum_address(token_address)
+        for symbol, token_address in PORTFOLIO_TOKENS.get(chain, {}).items()
+    }
+
+    try:
+        decimals = await get_decimals(w3, chain, tokens)
+
+        batches = await asyncio.gather(*[
+            scan_batch(w3, chain, addresses[i:i + PORTFOLIO_BATCH_SIZE], tokens, semaphore)
+            for i in range(0, len(addresses), PORTFOLIO_BATCH_SIZE)
+        ])
+    except Exception as error:
+        logger.error(f"Portfolio scan of {chain} failed | {error}")
+        return {}
+
+    portfolio = {}
+    for batch in batches:
+        for address, balances in batch.items():
+            native_balance, token_balances = balances[0], balances[1:]
+
+            portfolio[address] = {f"{chain}_{RPC[chain]['token']}": native_balance / 10 ** 18}
+            for (symbol, _), balance in zip(tokens.items(), token_balances):
+                if symbol in decimals:
+                    portfolio[address][f"{chain}_{symbol}"] = balance / 10 ** decimals[symbol]
+                else:
+                    portfolio[address][f"{chain}_{symbol}"] = None
+
+    return portfolio
+
+
+async def check_portfolio():
+    logger.info("Start portfolio checker")
+
+    start_time = time.time()
+
+    addresses = get_addresses()
+    chains = [chain for chain in RPC if chain in MULTICALL_CONTRACTS]
+    semaphore = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+
+    try:
+        chain_portfolios = await asyncio.gather(*[scan_chain(chain, addresses, semaphore) for chain in chains])
+    finally:
+        await provider_registry.close()
+
+    columns = []
+    for chain_portfolio in chain_portfolios:
+        if chain_portfolio:
+            columns.extend(next(iter(chain_portfolio.values())))
+
+    file_name = f"portfolio_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+
+    with open(file_name, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["#", "Address", *columns])
+
+        for _id, address in enumerate(addresses, start=1):
+            row = {}
+            for chain_portfolio in chain_portfolios:
+                row.update(chain_portfolio.get(address, {}))
+
+            writer.writerow([_id, address, *[row.get(column, "") for column in columns]])
+
+    logger.success(
+        f"Portfolio of {len(addresses)} wallets on {len(chains)} chains saved to {file_name} | "
+        f"{round(time.time() - start_time, 2)} s."
+    )
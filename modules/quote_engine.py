@@ -0,0 +1,183 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, Tuple, Union
+
+from loguru import logger
+from config import ZKSYNC_TOKENS, ZERO_ADDRESS
+from settings import QUOTE_DEADLINE
+from .account import Account
+
+NATIVE_ADDRESS = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+# Rough gas units of a swap on the routers that don't report an estimate with the quote
+SWAP_GAS = {
+    "syncswap": 600_000,
+    "mute": 700_000,
+    "spacefi": 700_000,
+    "zkswap": 700_000,
+    "vesync": 700_000,
+    "woofi": 800_000,
+    "pancake": 900_000,
+    "maverick": 1_000_000,
+}
+DEFAULT_SWAP_GAS = 800_000
+
+# (venue module, from token, to token, amount in wei) -> (amount out in wei, gas units or None)
+Quoter = Callable[[Account, str, str, int], Awaitable[Tuple[int, Union[None, int]]]]
+
+
+async def quote_syncswap(module, from_token: str, to_token: str, amount: int):
+    pool_address = await module.get_pool(from_token, to_token)
+
+    if pool_address == ZERO_ADDRESS:
+        return 0, None
+
+    token_address = module.w3.to_checksum_address(ZKSYNC_TOKENS[from_token])
+
+    return await module.get_min_amount_out(pool_address, token_address, amount, 0), None
+
+
+async def quote_router(module, from_token: str, to_token: str, amount: int):
+    return await module.get_min_amount_out(ZKSYNC_TOKENS[from_token], ZKSYNC_TOKENS[to_token], amount, 0), None
+
+
+async def quote_pancake(module, from_token: str, to_token: str, amount: int):
+    if await module.get_pool(from_token, to_token) == ZERO_ADDRESS:
+        return 0, None
+
+    return await module.get_min_amount_out(from_token, to_token, amount, 0), None
+
+
+async def quote_maverick(module, from_token: str, to_token: str, amount: int):
+    # The module trades one ETH/USDC pool
+    if {from_token, to_token} != {"ETH", "USDC"}:
+        return 0, None
+
+    return await module.get_min_amount_out(amount, from_token == "ETH", 0), None
+
+
+async def quote_woofi(module, from_token: str, to_token: str, amount: int):
+    from_token_address = NATIVE_ADDRESS if from_token == "ETH" else ZKSYNC_TOKENS[from_token]
+    to_token_address = NATIVE_ADDRESS if to_token == "ETH" else ZKSYNC_TOKENS[to_token]
+
+    return await module.get_min_amount_out(from_token_address, to_token_address, amount, 0), None
+
+
+async def quote_odos(module, from_token: str, to_token: str, amount: int):
+    quote_data = await module.quote(
+        ZERO_ADDRESS if from_token == "ETH" else ZKSYNC_TOKENS[from_token],
+        ZERO_ADDRESS if to_token == "ETH" else ZKSYNC_TOKENS[to_token],
+        amount,
+        1
+    )
+
+    if not quote_data:
+        return 0, None
+
+    return int(quote_data["outAmounts"][0]), quote_data.get("gasEstimate")
+
+
+async def quote_xyswap(module, from_token: str, to_token: str, amount: int):
+    quote_data = await module.get_quote(
+        NATIVE_ADDRESS if from_token == "ETH" else ZKSYNC_TOKENS[from_token],
+        NATIVE_ADDRESS if to_token == "ETH" else ZKSYNC_TOKENS[to_token],
+        amount,
+        1
+    )
+
+    if not quote_data.get("routes"):
+        return 0, None
+
+    route = quote_data["routes"][0]
+
+    return int(route["dstQuoteTokenAmount"]), route.get("estimatedGas")
+
+
+QUOTERS: Dict[str, Quoter] = {
+    "syncswap": quote_syncswap,
+    "mute": quote_router,
+    "spacefi": quote_router,
+    "zkswap": quote_router,
+    "vesync": quote_router,
+    "pancake": quote_pancake,
+    "maverick": quote_maverick,
+    "woofi": quote_woofi,
+    "odos": quote_odos,
+    "xyswap": quote_xyswap,
+}
+
+
+def get_net_output(from_token: str, to_token: str, amount: int, amount_out: int, gas_cost: int) -> int:
+    """
+    Output minus the gas cost in the output token, priced by the quote itself when ETH is on one side
+    """
+    if to_token == "ETH":
+        return amount_out - gas_cost
+    if from_token == "ETH":
+        return amount_out - gas_cost * amount_out // amount
+
+    return amount_out
+
+
+async def get_best_swap_module(
+        account: Account,
+        swap_modules: Dict[str, type],
+        use_dex: List[str],
+        from_token: str,
+        to_token: str,
+        amount: int
+):
+    """
+    Quote the swap on every enabled venue at once and pick the best net-of-gas output.
+    Venues that don't answer within QUOTE_DEADLINE are dropped, a random venue is used if nobody quoted
+    """
+    venues = [dex for dex in dict.fromkeys(use_dex) if dex in QUOTERS]
+
+    if not venues or amount <= 0:
+        return swap_modules[random.choice(use_dex)]
+
+    tasks = {}
+    for dex in venues:
+        module = swap_modules[dex](account.account_id, account.private_key, account.proxy)
+        tasks[asyncio.create_task(QUOTERS[dex](module, from_token, to_token, amount))] = dex
+
+    gas_price_task = asyncio.ensure_future(account.w3.eth.gas_price)
+
+    done, pending = await asyncio.wait([*tasks, gas_price_task], timeout=QUOTE_DEADLINE)
+
+    for task in pending:
+        task.cancel()
+
+    gas_price = gas_price_task.result() if gas_price_task in done and not gas_price_task.exception() else 0
+
+    quotes = {}
+    for task, dex in tasks.items():
+        if task not in done:
+            logger.debug(f"[{account.account_id}][{account.address}] {dex} quote timed out")
+            continue
+
+        if task.exception() is not None:
+            logger.debug(f"[{account.account_id}][{account.address}] {dex} quote failed | {task.exception()}")
+            continue
+
+        amount_out, gas = task.result()
+
+        if amount_out > 0:
+            gas_cost = int(gas or SWAP_GAS.get(dex, DEFAULT_SWAP_GAS)) * gas_price
+            quotes[dex] = get_net_output(from_token, to_token, amount, amount_out, gas_cost)
+
+    if not quotes:
+        logger.warning(
+            f"[{account.account_id}][{account.address}] No quotes for {from_token} -> {to_token}, use random dex"
+        )
+
+        return swap_modules[random.choice(use_dex)]
+
+    best_dex = max(quotes, key=quotes.get)
+
+    logger.info(
+        f"[{account.account_id}][{account.address}] Best quote {from_token} -> {to_token} on {best_dex} | "
+        f"{len(quotes)}/{len(venues)} venues quoted"
+    )
+
+    return swap_modules[best_dex]
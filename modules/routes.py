@@ -1,10 +1,48 @@
+import asyncio
+import functools
+import hashlib
+import json
 import random
-from typing import Union, List
+import time
+from typing import Callable, Union, List
 
 from loguru import logger
-from utils.sleeping import sleep
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+from settings import RESUME_ROUTES
+from utils.providers import provider_registry
+from utils.scheduler import current_scheduler
+from utils.sleeping import sleep_for
+from utils.task_store import task_store, current_step, split_tx_hash, FINISHED_STEPS
 from .account import Account
 
+APPROVE_SELECTOR = "0x095ea7b3"
+TX_WAIT_TIME = 180  # Second, a recorded transaction not mined by then counts as dropped
+
+
+def get_module_name(module) -> Union[None, str]:
+    return None if module is None else module.__name__
+
+
+def get_fingerprint(*settings) -> str:
+    """
+    Hash of the route settings, a saved route is resumed only if they didn't change
+    """
+    def encode(value):
+        if isinstance(value, (list, tuple)):
+            return [type(value).__name__, [encode(item) for item in value]]
+        if callable(value):
+            return get_module_name(value)
+        return value
+
+    return hashlib.sha256(json.dumps(encode(settings)).encode()).hexdigest()
+
+
+def resolve_module(name: str) -> Union[None, Callable]:
+    import modules_settings
+
+    return getattr(modules_settings, name, None)
+
 
 class Routes(Account):
     def __init__(self, account_id: int, private_key: str, proxy: Union[None, str]) -> None:
@@ -64,21 +102,180 @@ class Routes(Account):
             return [random.choice(cheap_modules + ([None] if use_none else [])),
                     self.generate_nested_module(cheap_modules, use_none)]
 
+    async def run_route(self, kind: str, fingerprint: str, plan: Callable[[], List], sleep_from: int, sleep_to: int):
+        """
+        Walk the planned modules, with RESUME_ROUTES the plan and the progress are kept in the task store
+        and an unfinished route of the wallet is continued instead of planning a new one
+        """
+        if not RESUME_ROUTES:
+            route = {
+                "id": None,
+                "steps": [
+                    {"position": position, "module": get_module_name(module), "func": module, "status": "pending"}
+                    for position, module in enumerate(plan())
+                ],
+            }
+            return await self.run_steps(route, 0, sleep_from, sleep_to)
+
+        route = task_store.get_active_route(self.address, kind, fingerprint)
+
+        if route is None:
+            route = task_store.create_route(self.address, kind, fingerprint, [get_module_name(m) for m in plan()])
+        else:
+            done = sum(step["status"] in FINISHED_STEPS for step in route["steps"])
+            logger.info(f"[{self.account_id}][{self.address}] Resume route from step {done + 1}/{len(route['steps'])}")
+
+            if route["next_run_at"] > time.time():
+                delay = route["next_run_at"] - time.time()
+                scheduler = current_scheduler.get()
+
+                if scheduler is not None:
+                    return self.continue_later(scheduler, delay, route, 0, sleep_from, sleep_to)
+
+                await sleep_for(delay)
+
+        await self.run_steps(route, 0, sleep_from, sleep_to)
+
+    def continue_later(self, scheduler, delay: float, route, index: int, sleep_from: int, sleep_to: int):
+        logger.info(f"[{self.account_id}][{self.address}] Next step in {round(delay)} s.")
+
+        scheduler.schedule_after(delay, functools.partial(self.run_steps, route, index, sleep_from, sleep_to))
+
+    async def run_steps(self, route, index: int, sleep_from: int, sleep_to: int):
+        """
+        Run the steps from index on. With a scheduler the wallet gives up its worker between the steps
+        and the next step is queued, otherwise it sleeps in place.
+        """
+        steps = route["steps"]
+
+        for index in range(index, len(steps)):
+            step = steps[index]
+
+            if step["status"] in FINISHED_STEPS:
+                continue
+
+            if route["id"] is None:
+                await self.run_step(step["func"])
+            else:
+                await self.run_saved_step(route, step)
+
+            step["status"] = "done"
+
+            delay = random.randint(sleep_from, sleep_to)
+
+            if route["id"] is not None:
+                task_store.set_next_run(route["id"], time.time() + delay)
+
+            scheduler = current_scheduler.get()
+            if scheduler is not None:
+                return self.continue_later(scheduler, delay, route, index + 1, sleep_from, sleep_to)
+
+            await sleep_for(delay)
+
+        if route["id"] is not None:
+            task_store.finish_route(route["id"])
+
+    def get_chain_w3(self, chain: str) -> AsyncWeb3:
+        return self.w3 if chain == self.chain else provider_registry.get_w3(
+            chain, f"http://{self.proxy}" if self.proxy else None
+        )
+
+    async def get_tx_status(self, entry: str) -> Union[None, int]:
+        """
+        Receipt status of a recorded transaction, None if it isn't mined within TX_WAIT_TIME
+        """
+        chain, tx_hash = split_tx_hash(entry)
+        w3 = self.get_chain_w3(chain)
+
+        start_time = time.time()
+        while True:
+            try:
+                receipt = await w3.eth.get_transaction_receipt(tx_hash)
+                return receipt.get("status")
+            except TransactionNotFound:
+                if time.time() - start_time > TX_WAIT_TIME:
+                    return None
+
+                await asyncio.sleep(5)
+
+    async def is_approve(self, entry: str) -> bool:
+        chain, tx_hash = split_tx_hash(entry)
+        transaction = await self.get_chain_w3(chain).eth.get_transaction(tx_hash)
+
+        return AsyncWeb3.to_hex(transaction["input"])[:10] == APPROVE_SELECTOR
+
+    async def is_step_done(self, tx_hashes: List[str]) -> bool:
+        """
+        Whether a step interrupted by a restart got through: its last transaction was mined successfully
+        and isn't the approve swaps send before the swap itself
+        """
+        return await self.get_tx_status(tx_hashes[-1]) == 1 and not await self.is_approve(tx_hashes[-1])
+
+    async def run_saved_step(self, route, step):
+        position = step["position"]
+        interrupted = step["status"] == "running" and step["tx_hashes"]
+
+        if interrupted and await self.is_step_done(step["tx_hashes"]):
+            logger.info(
+                f"[{self.account_id}][{self.address}] {step['module']} already sent "
+                f"{', '.join(step['tx_hashes'])} before restart, don't repeat it"
+            )
+            task_store.finish_step(route["id"], position, "done")
+        elif step["module"] is not None and resolve_module(step["module"]) is None:
+            logger.warning(f"[{self.account_id}][{self.address}] Unknown module {step['module']}, skip it")
+            task_store.finish_step(route["id"], position, "skipped")
+        else:
+            if interrupted:
+                logger.warning(
+                    f"[{self.account_id}][{self.address}] {step['module']} didn't get through before restart "
+                    f"({step['tx_hashes'][-1]}), run it again"
+                )
+
+            task_store.start_step(route["id"], position)
+            token = current_step.set((route["id"], position))
+
+            try:
+                await self.run_step(resolve_module(step["module"]) if step["module"] else None)
+            except Exception:
+                task_store.finish_step(route["id"], position, "failed")
+                raise
+            finally:
+                current_step.reset(token)
+
+            task_store.finish_step(route["id"], position, await self.get_step_status(route["id"], step))
+
+    async def get_step_status(self, route_id: int, step) -> str:
+        if step["module"] is None:
+            return "skipped"
+
+        tx_hashes = task_store.get_tx_hashes(route_id, step["position"])
+
+        if tx_hashes and await self.get_tx_status(tx_hashes[-1]) != 1:
+            logger.error(f"[{self.account_id}][{self.address}] {step['module']} transaction {tx_hashes[-1]} failed")
+            return "failed"
+
+        return "done"
+
+    async def run_step(self, module):
+        if module is None:
+            logger.info(f"[{self.account_id}][{self.address}] Skip module")
+        else:
+            await module(self.account_id, self.private_key, self.proxy)
+
     async def start(self, use_modules: list, sleep_from: int, sleep_to: int, random_module: bool):
         logger.info(f"[{self.account_id}][{self.address}] Start using routes")
 
-        run_modules = self.run_modules(use_modules)
+        def plan():
+            run_modules = self.run_modules(use_modules)
 
-        if random_module:
-            random.shuffle(run_modules)
+            if random_module:
+                random.shuffle(run_modules)
 
-        for module in run_modules:
-            if module is None:
-                logger.info(f"[{self.account_id}][{self.address}] Skip module")
-            else:
-                await module(self.account_id, self.private_key, self.proxy)
+            return run_modules
 
-            await sleep(sleep_from, sleep_to)
+        await self.run_route(
+            "custom", get_fingerprint(use_modules, random_module), plan, sleep_from, sleep_to
+        )
 
     async def start_automatic(self, transaction_count, cheap_ratio,
                               sleep_from, sleep_to,
@@ -86,15 +283,15 @@ class Routes(Account):
                               use_none):
         logger.info(f"[{self.account_id}][{self.address}] Start using automatic routes")
 
-        use_modules = self.generate_module_sequence(cheap_modules, expensive_modules,
-                                                    transaction_count, cheap_ratio,
-                                                    use_none)
+        def plan():
+            use_modules = self.generate_module_sequence(cheap_modules, expensive_modules,
+                                                        transaction_count, cheap_ratio,
+                                                        use_none)
 
-        run_modules = self.run_modules(use_modules)
+            return self.run_modules(use_modules)
 
-        for module in run_modules:
-            if module is None:
-                logger.info(f"[{self.account_id}][{self.address}] Skip module")
-            else:
-                await module(self.account_id, self.private_key, self.proxy)
-            await sleep(sleep_from, sleep_to)
+        await self.run_route(
+            "automatic",
+            get_fingerprint(transaction_count, cheap_ratio, cheap_modules, expensive_modules, use_none),
+            plan, sleep_from, sleep_to
+        )
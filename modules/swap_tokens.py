@@ -3,7 +3,21 @@ from typing import Union, List
 
 from loguru import logger
 from config import ZKSYNC_TOKENS
-from modules import *
+from settings import USE_BEST_QUOTE
+from .account import Account
+from .syncswap import SyncSwap
+from .mute import Mute
+from .spacefi import SpaceFi
+from .pancake import Pancake
+from .woofi import WooFi
+from .odos import Odos
+from .zkswap import ZKSwap
+from .xyswap import XYSwap
+from .openocean import OpenOcean
+from .inch import Inch
+from .maverick import Maverick
+from .vesync import VeSync
+from .quote_engine import get_best_swap_module
 from utils.sleeping import sleep
 
 
@@ -45,14 +59,24 @@ class SwapTokens(Account):
 
         logger.info(f"[{self.account_id}][{self.address}] Start swap tokens")
 
+        balances = await self.get_balances([ZKSYNC_TOKENS[token] for token in tokens if token != "ETH"])
+
         for _, token in enumerate(tokens, start=1):
             if token == "ETH":
                 continue
 
-            balance = await self.get_balance(ZKSYNC_TOKENS[token])
+            balance = balances[self.w3.to_checksum_address(ZKSYNC_TOKENS[token])]
 
             if balance["balance_wei"] > 0:
-                swap_module = self.get_swap_module(use_dex)(self.account_id, self.private_key, self.proxy)
+                if USE_BEST_QUOTE:
+                    amount_wei = int(balance["balance_wei"] / 100 * (min_percent + max_percent) / 2)
+                    swap_module = await get_best_swap_module(
+                        self, self.swap_modules, use_dex, token, "ETH", amount_wei
+                    )
+                else:
+                    swap_module = self.get_swap_module(use_dex)
+
+                swap_module = swap_module(self.account_id, self.private_key, self.proxy)
                 await swap_module.swap(
                     token,
                     "ETH",
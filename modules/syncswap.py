@@ -10,11 +10,16 @@ from config import (
     SYNCSWAP_ROUTER_ABI,
     SYNCSWAP_CLASSIC_POOL_DATA_ABI
 )
+from settings import PIPELINE_APPROVE, USE_RESERVE_CACHE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.reserve_cache import reserve_cache, get_amount_out
 from .account import Account
 from eth_abi import abi
 
+# Pool swap fees are in 1e-5 (300 is 0.3%)
+SYNCSWAP_FEE_PRECISION = 100000
+
 
 class SyncSwap(Account):
     def __init__(self, account_id: int, private_key: str, proxy: Union[None, str]) -> None:
@@ -25,14 +30,63 @@ class SyncSwap(Account):
     async def get_pool(self, from_token: str, to_token: str):
         contract = self.get_contract(SYNCSWAP_CONTRACTS["classic_pool"], SYNCSWAP_CLASSIC_POOL_ABI)
 
-        pool_address = await contract.functions.getPool(
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
-            self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
-        ).call()
+        pool_address = await self.get_cached_pool(
+            SYNCSWAP_CONTRACTS["classic_pool"],
+            ZKSYNC_TOKENS[from_token],
+            ZKSYNC_TOKENS[to_token],
+            contract.functions.getPool(
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token]),
+                self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
+            ).call
+        )
 
         return pool_address
 
+    async def get_local_amount_out(self, pool_address: str, token_address: str, amount: int) -> Union[None, int]:
+        pool_contract = self.get_contract(pool_address, SYNCSWAP_CLASSIC_POOL_DATA_ABI)
+
+        state = await reserve_cache.get(
+            self.w3,
+            self.chain,
+            ("syncswap", pool_contract.address),
+            [pool_contract.functions.getReserves(), pool_contract.functions.token0(), pool_contract.functions.token1()]
+        )
+
+        if state is None:
+            return None
+
+        (reserve0, reserve1), token0, token1 = state
+
+        if token0.lower() == token_address.lower():
+            token_in, token_out, reserve_in, reserve_out = token0, token1, reserve0, reserve1
+        else:
+            token_in, token_out, reserve_in, reserve_out = token1, token0, reserve1, reserve0
+
+        # The fee is dynamic and may differ by direction. It's registered in the same snapshot as the reserves,
+        # with the zero address as the sender to share it between wallets
+        fee = await reserve_cache.get(
+            self.w3,
+            self.chain,
+            ("syncswap-fee", pool_contract.address, token_in),
+            [pool_contract.functions.getSwapFee(ZERO_ADDRESS, token_in, token_out, "0x")]
+        )
+
+        if fee is None:
+            return None
+
+        return get_amount_out(amount, reserve_in, reserve_out, fee[0], SYNCSWAP_FEE_PRECISION)
+
     async def get_min_amount_out(self, pool_address: str, token_address: str, amount: int, slippage: float):
+        if USE_RESERVE_CACHE:
+            try:
+                amount_out = await self.get_local_amount_out(pool_address, token_address, amount)
+            except Exception as error:
+                logger.warning(f"[{self.account_id}][{self.address}] Local quote failed, use on-chain quote | {error}")
+                amount_out = None
+
+            if amount_out:
+                return int(amount_out - (amount_out / 100 * slippage))
+
         pool_contract = self.get_contract(pool_address, SYNCSWAP_CLASSIC_POOL_DATA_ABI)
 
         min_amount_out = await pool_contract.functions.getAmountOut(
@@ -76,12 +130,15 @@ class SyncSwap(Account):
         pool_address = await self.get_pool(from_token, to_token)
 
         if pool_address != ZERO_ADDRESS:
-            tx_data = await self.get_tx_data()
-
-            if from_token == "ETH":
-                tx_data.update({"value": amount_wei})
-            else:
-                await self.approve(amount_wei, token_address, self.w3.to_checksum_address(SYNCSWAP_CONTRACTS["router"]))
+            if from_token != "ETH":
+                await self.approve(
+                    amount_wei,
+                    token_address,
+                    self.w3.to_checksum_address(SYNCSWAP_CONTRACTS["router"]),
+                    pipeline=PIPELINE_APPROVE
+                )
+
+            tx_data = await self.get_tx_data(amount_wei if from_token == "ETH" else 0)
 
             min_amount_out = await self.get_min_amount_out(pool_address, token_address, amount_wei, slippage)
 
@@ -1,25 +1,20 @@
 import asyncio
-import random
 
 from eth_typing import ChecksumAddress
 from loguru import logger
-from web3 import AsyncWeb3, AsyncHTTPProvider
-from web3.eth import AsyncEth
 from eth_account import Account as EthereumAccount
 from tabulate import tabulate
 from utils.password_handler import get_wallet_data
+from utils.providers import provider_registry
 
-from config import RPC
+from settings import PORTFOLIO_CONCURRENCY
 
 
-async def get_nonce(address: ChecksumAddress):
-    web3 = AsyncWeb3(
-        AsyncHTTPProvider(random.choice(RPC["zksync"]["rpc"])),
-        modules={"eth": (AsyncEth,)},
-        middlewares=[],
-    )
+async def get_nonce(address: ChecksumAddress, semaphore: asyncio.Semaphore):
+    web3 = provider_registry.get_w3("zksync")
 
-    nonce = await web3.eth.get_transaction_count(address)
+    async with semaphore:
+        nonce = await web3.eth.get_transaction_count(address)
 
     return nonce
 
@@ -29,13 +24,18 @@ async def check_tx():
 
     logger.info("Start transaction checker")
 
+    semaphore = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+
     accounts = [data['private_key'] for _, data in get_wallet_data().items()]
     for _id, pk in enumerate(accounts, start=1):
         account = EthereumAccount.from_key(pk)
 
-        tasks.append(asyncio.create_task(get_nonce(account.address), name=account.address))
+        tasks.append(asyncio.create_task(get_nonce(account.address, semaphore), name=account.address))
 
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await provider_registry.close()
 
     table = [[k, i.get_name(), i.result()] for k, i in enumerate(tasks, start=1)]
 
@@ -2,6 +2,7 @@ from typing import Union, Dict
 
 from loguru import logger
 from config import WOOFI_CONTRACTS, WOOFI_ROUTER_ABI, ZKSYNC_TOKENS
+from settings import PIPELINE_APPROVE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
 from .account import Account
@@ -49,18 +50,16 @@ class WooFi(Account):
             f"[{self.account_id}][{self.address}] Swap on WooFi – {from_token} -> {to_token} | {amount} {from_token}"
         )
 
-        tx_data = await self.get_tx_data()
-
         if from_token == "ETH":
             from_token_address = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
             to_token_address = self.w3.to_checksum_address(ZKSYNC_TOKENS[to_token])
-            
-            tx_data.update({"value": amount_wei})
         else:
             from_token_address = self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token])
             to_token_address = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
 
-            await self.approve(amount_wei, from_token_address, WOOFI_CONTRACTS["router"])
+            await self.approve(amount_wei, from_token_address, WOOFI_CONTRACTS["router"], pipeline=PIPELINE_APPROVE)
+
+        tx_data = await self.get_tx_data(amount_wei if from_token == "ETH" else 0)
 
         min_amount_out = await self.get_min_amount_out(from_token_address, to_token_address, amount_wei, slippage)
 
@@ -1,10 +1,11 @@
 from typing import Union, Dict
 
-import aiohttp
 from loguru import logger
 from config import XYSWAP_CONTRACT, ZKSYNC_TOKENS
 from utils.gas_checker import check_gas
 from utils.helpers import retry
+from utils.http_client import http_client
+from utils.rate_limiter import rate_limiter
 from .account import Account
 
 
@@ -21,17 +22,18 @@ class XYSwap(Account):
         url = "https://aggregator-api.xy.finance/v1/quote"
 
         params = {
-            "srcChainId": await self.w3.eth.chain_id,
+            "srcChainId": await self.get_chain_id(),
             "srcQuoteTokenAddress": self.w3.to_checksum_address(from_token),
             "srcQuoteTokenAmount": amount,
-            "dstChainId": await self.w3.eth.chain_id,
+            "dstChainId": await self.get_chain_id(),
             "dstQuoteTokenAddress": self.w3.to_checksum_address(to_token),
             "slippage": slippage
         }
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        await rate_limiter.acquire("xyswap", self.proxy)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.get(url=url, params=params, proxy=self.proxy) as response:
             transaction_data = await response.json()
 
             return transaction_data
@@ -40,10 +42,10 @@ class XYSwap(Account):
         url = "https://aggregator-api.xy.finance/v1/buildTx"
 
         params = {
-            "srcChainId": await self.w3.eth.chain_id,
+            "srcChainId": await self.get_chain_id(),
             "srcQuoteTokenAddress": self.w3.to_checksum_address(from_token),
             "srcQuoteTokenAmount": amount,
-            "dstChainId": await self.w3.eth.chain_id,
+            "dstChainId": await self.get_chain_id(),
             "dstQuoteTokenAddress": self.w3.to_checksum_address(to_token),
             "slippage": slippage,
             "receiver": self.address,
@@ -56,9 +58,10 @@ class XYSwap(Account):
                 "commissionRate": 10000
             })
 
-        async with aiohttp.ClientSession() as session:
-            response = await session.get(url=url, params=params, proxy=self.proxy)
+        await rate_limiter.acquire("xyswap", self.proxy)
+        session = await http_client.get_session(url, self.proxy)
 
+        async with session.get(url=url, params=params, proxy=self.proxy) as response:
             transaction_data = await response.json()
 
             return transaction_data
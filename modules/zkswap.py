@@ -3,6 +3,7 @@ from typing import Union
 
 from loguru import logger
 from config import ZKSWAP_ROUTER_ABI, ZKSWAP_CONTRACTS, ZKSYNC_TOKENS
+from settings import PIPELINE_APPROVE
 from utils.gas_checker import check_gas
 from utils.helpers import retry
 from .account import Account
@@ -49,7 +50,7 @@ class ZKSwap(Account):
     async def swap_to_eth(self, from_token: str, to_token: str, amount: int, slippage: int):
         token_address = self.w3.to_checksum_address(ZKSYNC_TOKENS[from_token])
 
-        await self.approve(amount, token_address, ZKSWAP_CONTRACTS["router"])
+        await self.approve(amount, token_address, ZKSWAP_CONTRACTS["router"], pipeline=PIPELINE_APPROVE)
 
         tx_data = await self.get_tx_data()
 
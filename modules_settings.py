@@ -88,7 +88,7 @@ async def bridge_orbiter(account_id, key, proxy):
     save_funds = [0.0006, 0.001]
     min_required_amount = 0.001
 
-    orbiter = Orbiter(account_id, key, from_chains, proxy, min_required_amount)
+    orbiter = await Orbiter.create(account_id, key, from_chains, proxy, min_required_amount)
     await orbiter.bridge(to_chain, min_amount, max_amount, decimal, all_amount, min_percent, max_percent, save_funds)
 
 
@@ -1063,3 +1063,7 @@ async def create_safe(account_id, key, proxy):
 
 def get_tx_count():
     asyncio.run(check_tx())
+
+
+def get_portfolio():
+    asyncio.run(check_portfolio())
@@ -1,7 +1,7 @@
 # RANDOM WALLETS MODE
 RANDOM_WALLET = True  # True or False
 
-# removing a wallet from the list after the job is done
+# skip wallets that already finished the module on the next run (data/state/completed.log)
 REMOVE_WALLET = False
 
 SLEEP_FROM = 500  # Second
@@ -12,6 +12,54 @@ QUANTITY_THREADS = 1
 THREAD_SLEEP_FROM = 300
 THREAD_SLEEP_TO = 600
 
+# ASYNC SCHEDULER MODE
+# if True, all wallets run as tasks on one event loop instead of one thread + event loop per wallet
+USE_ASYNC_SCHEDULER = False
+ASYNC_CONCURRENCY = 100  # max wallets in flight at the same time (replaces QUANTITY_THREADS)
+
+# RPC CONNECTION POOL
+RPC_POOL_SIZE = 100  # max open connections to the RPC nodes per event loop
+RPC_KEEPALIVE_TIMEOUT = 60  # Second
+RPC_TIMEOUT = 10  # Second
+
+# HTTP API CONNECTION POOL (aggregators, bridges, OKX)
+HTTP_POOL_SIZE = 20  # max open connections per API host and proxy
+HTTP_KEEPALIVE_TIMEOUT = 60  # Second
+HTTP_TIMEOUT = 30  # Second
+
+# API RATE LIMITS
+# requests per second and burst of the off-chain APIs, per API key (1inch, OKX) or per proxy (the others).
+# Requests over the limit wait in a queue instead of failing with HTTP 429
+API_RATE_LIMITS = {
+    "inch": {"rate": 1, "burst": 1},
+    "odos": {"rate": 5, "burst": 10},
+    "xyswap": {"rate": 5, "burst": 10},
+    "openocean": {"rate": 2, "burst": 2},
+    "orbiter": {"rate": 5, "burst": 10},
+    "okx": {"rate": 3, "burst": 5},
+}
+
+# PORTFOLIO CHECKER
+PORTFOLIO_CONCURRENCY = 16  # max multicall requests in flight
+PORTFOLIO_BATCH_SIZE = 200  # wallets per multicall request
+
+# ROUTES
+# if True, custom and automatic routes are saved to data/state/tasks.sqlite3
+# and a restarted script continues every wallet from the step where it stopped
+RESUME_ROUTES = False
+
+# BEST QUOTE MODE
+# if True, swap_tokens and swap_multiswap quote the swap on every dex of use_dex at once and use the best
+# output net of gas. Dexes without a quote (openocean, inch) are only used when no dex could quote
+USE_BEST_QUOTE = False
+QUOTE_DEADLINE = 3  # Second, dexes that don't quote in time are skipped
+
+# RESERVE CACHE MODE
+# if True, SyncSwap classic pools compute the min amount out locally from pool reserves and fees,
+# fetched for all pools in one multicall per block and shared by every wallet (falls back to on-chain quotes)
+USE_RESERVE_CACHE = False
+RESERVE_SNAPSHOT_TTL = 1  # Second, about one zkSync block
+
 # PROXY MODE
 USE_PROXY = True
 
@@ -24,13 +72,46 @@ REALTIME_GWEI = True  # если включен, то будет считыва
 RANDOMIZE_GWEI = True  # if True, max Gwei will be randomized for each wallet for each transaction
 MAX_GWEI_RANGE = [24, 27]
 
-GAS_SLEEP_FROM = 100
-GAS_SLEEP_TO = 600
+GAS_ORACLE_INTERVAL = 30  # Second, how often the gas price is refreshed while wallets wait for normal gas
 
 GAS_MULTIPLIER = 1
 
+# Send the approve and the swap back to back with consecutive nonces and wait for both receipts together.
+# The swap can't be estimated before the approve is mined, it is sent with the PIPELINE_GAS_LIMIT of its chain
+# (unused gas is refunded, but the wallet needs ETH for the whole limit). zkSync limits include the pubdata cost,
+# keep them well above a usual swap. Chains not listed here wait for the approve as usual
+PIPELINE_APPROVE = False
+PIPELINE_GAS_LIMIT = {
+    "zksync": 10_000_000,
+}
+
+# GAS ESTIMATE CACHE
+# if True, repeated calls (same contract and function) reuse a high percentile of their recent gas estimates
+# times GAS_MULTIPLIER instead of estimating every transaction. New and volatile functions are still estimated.
+# Transactions with a cached limit are still simulated with one eth_call, so reverts are caught before sending
+USE_GAS_CACHE = False
+GAS_CACHE_SAMPLES = 20  # recent estimates kept per contract and function
+GAS_CACHE_MIN_SAMPLES = 5  # estimates needed before the cache is used
+GAS_CACHE_PERCENTILE = 95
+GAS_CACHE_MAX_SPREAD = 0.2  # (max - min) / median of the estimates above which the function is always estimated
+
 # RETRY MODE
-RETRY_COUNT = 3
+RETRY_COUNT = 3  # retries of errors that match no class below
+
+# Retries by error class: max retries, first delay in seconds (doubled on every retry, randomized up to x2)
+# and delay cap. Reverts, insufficient funds and config errors fail the same way again, they are not retried
+RETRY_POLICY = {
+    "rate_limit": {"retries": 6, "delay": 5, "max_delay": 120},
+    "timeout": {"retries": 4, "delay": 5, "max_delay": 60},
+    "nonce": {"retries": 3, "delay": 2, "max_delay": 10},
+    "revert": {"retries": 0},
+    "insufficient_funds": {"retries": 0},
+    "config": {"retries": 0},
+}
+
+# A module is paused for all wallets after this many rate limits / timeouts in a row
+CIRCUIT_BREAKER_THRESHOLD = 10
+CIRCUIT_BREAKER_COOLDOWN = 60  # Second
 
 # INCH API KEY
 INCH_API_KEY = ""
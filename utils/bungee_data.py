@@ -1,10 +1,11 @@
-import aiohttp
+from utils.http_client import http_client
 
 
 async def get_bungee_data():
-    async with aiohttp.ClientSession() as session:
-        url = "https://refuel.socket.tech/chains"
-        response = await session.get(url)
+    url = "https://refuel.socket.tech/chains"
+    session = await http_client.get_session(url)
+
+    async with session.get(url) as response:
         response_data = await response.json()
         if response.status == 200:
             data = response_data["result"]
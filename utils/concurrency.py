@@ -0,0 +1,48 @@
+import asyncio
+from typing import Callable
+
+
+class DynamicSemaphore:
+    """
+    Semaphore whose limit is read from a callable, so it can change while tasks are waiting.
+    Call wake() after the limit went up to let the waiting tasks in right away.
+
+    try_acquire() takes a slot without waiting, for dispatchers that keep their own queue.
+    """
+
+    def __init__(self, get_limit: Callable[[], int]) -> None:
+        self.get_limit = get_limit
+        self.active = 0
+
+        self._condition = asyncio.Condition()
+
+    def has_slot(self) -> bool:
+        return self.active < max(self.get_limit(), 1)
+
+    def try_acquire(self) -> bool:
+        if not self.has_slot():
+            return False
+
+        self.active += 1
+        return True
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(self.has_slot)
+            self.active += 1
+
+    async def release(self):
+        self.active -= 1
+
+        async with self._condition:
+            self._condition.notify_all()
+
+    async def wake(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
@@ -0,0 +1,62 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from loguru import logger
+
+from config import TOKEN_METADATA_PATH, POOL_CACHE_PATH
+
+
+class JsonFileCache:
+    """
+    Small key/value cache kept in memory and persisted to a JSON file.
+    The file is read once on first access and rewritten atomically on every update.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+        self._data: Dict[str, Any] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = {}
+
+            if self.path.exists():
+                try:
+                    with open(self.path, "r") as file:
+                        self._data = json.load(file)
+                except (OSError, ValueError) as error:
+                    logger.warning(f"Cache {self.path} is broken and will be rebuilt | {error}")
+
+        return self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._load().get(key, default)
+
+    def update(self, items: Dict[str, Any]):
+        if not items:
+            return
+
+        with self._lock:
+            data = self._load()
+            data.update(items)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "w") as file:
+                json.dump(data, file, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+token_metadata_cache = JsonFileCache(TOKEN_METADATA_PATH)
+pool_cache = JsonFileCache(POOL_CACHE_PATH)
@@ -1,12 +1,13 @@
 import asyncio
+import functools
 import random
-from web3 import AsyncWeb3
-from web3.eth import AsyncEth
-from config import RPC, REALTIME_SETTINGS_PATH
-from settings import CHECK_GWEI, MAX_GWEI, GAS_SLEEP_FROM, GAS_SLEEP_TO, RANDOMIZE_GWEI, MAX_GWEI_RANGE, REALTIME_GWEI
+import threading
+import time
+from typing import Dict, Union
+from settings import CHECK_GWEI, MAX_GWEI, GAS_ORACLE_INTERVAL, RANDOMIZE_GWEI, MAX_GWEI_RANGE, REALTIME_GWEI
 from loguru import logger
-import json
-from utils.sleeping import sleep
+from utils.providers import provider_registry
+from utils.realtime_settings import realtime_settings
 
 
 def get_max_gwei_user_settings():
@@ -15,23 +16,13 @@ def get_max_gwei_user_settings():
         left_bound, right_bound = MAX_GWEI_RANGE
         max_gwei = random.uniform(left_bound, right_bound)
     if REALTIME_GWEI:
-        try:
-            with open(REALTIME_SETTINGS_PATH, 'r') as f:
-                new_max_gwei = json.load(f)['MAX_GWEI']
-            if new_max_gwei < 0:
-                raise ValueError('Max gwei is not an integer')
-            max_gwei = new_max_gwei
-        except Exception:
-            pass
+        max_gwei = realtime_settings.get("MAX_GWEI", max_gwei)
     return max_gwei
 
 
 async def get_gas():
     try:
-        w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(random.choice(RPC["ethereum"]["rpc"])),
-            modules={"eth": (AsyncEth,)},
-        )
+        w3 = provider_registry.get_w3("ethereum")
         gas_price = await w3.eth.gas_price
         gwei = w3.from_wei(gas_price, 'gwei')
         return gwei
@@ -39,21 +30,126 @@ async def get_gas():
         logger.error(error)
 
 
+class GasOracle:
+    """
+    Refreshes the L1 gas price every GAS_ORACLE_INTERVAL seconds while somebody waits for it
+    and wakes up all waiters of the event loop after every refresh.
+
+    The price itself is shared by the whole process, so event loops of other threads
+    reuse a fresh value instead of asking the RPC again. A price older than GAS_ORACLE_INTERVAL
+    counts as unknown, waiters never pass on it.
+    """
+
+    _gas = None
+    _updated_at = 0.0
+    _fetching = False
+    _lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.condition = asyncio.Condition()
+
+        self._waiters = 0
+        self._task = None
+
+    @property
+    def gas(self):
+        with GasOracle._lock:
+            if time.monotonic() - GasOracle._updated_at >= GAS_ORACLE_INTERVAL:
+                return None
+
+            return GasOracle._gas
+
+    async def _refresh(self):
+        with GasOracle._lock:
+            fetch = not GasOracle._fetching and time.monotonic() - GasOracle._updated_at >= GAS_ORACLE_INTERVAL
+            if fetch:
+                GasOracle._fetching = True
+
+        if fetch:
+            try:
+                gas = await get_gas()
+            finally:
+                with GasOracle._lock:
+                    GasOracle._fetching = False
+
+            if gas is not None:
+                with GasOracle._lock:
+                    GasOracle._gas, GasOracle._updated_at = gas, time.monotonic()
+
+        async with self.condition:
+            self.condition.notify_all()
+
+    async def _run(self):
+        while self._waiters:
+            await self._refresh()
+
+            with GasOracle._lock:
+                next_update = GasOracle._updated_at + GAS_ORACLE_INTERVAL - time.monotonic()
+
+            await asyncio.sleep(max(next_update, 1))
+
+    async def wait(self, predicate):
+        self._waiters += 1
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            async with self.condition:
+                await self.condition.wait_for(predicate)
+        finally:
+            self._waiters -= 1
+
+
+_oracles: Dict[asyncio.AbstractEventLoop, GasOracle] = {}
+_oracles_lock = threading.Lock()
+
+
+def get_gas_oracle() -> GasOracle:
+    loop = asyncio.get_running_loop()
+
+    with _oracles_lock:
+        oracle = _oracles.get(loop)
+
+        if oracle is None:
+            for closed_loop in [key for key in _oracles if key.is_closed()]:
+                del _oracles[closed_loop]
+
+            oracle = GasOracle()
+            _oracles[loop] = oracle
+
+    return oracle
+
+
 async def wait_gas():
     logger.info("Get GWEI")
-    while True:
-        gas = await get_gas()
+
+    oracle = get_gas_oracle()
+    last_gas: Union[None, float] = None
+
+    def is_gas_normal():
+        nonlocal last_gas
+
+        gas = oracle.gas
+        if gas is None:
+            return False
 
         max_gwei = get_max_gwei_user_settings()
+
         if gas > max_gwei:
-            logger.info(f'Current GWEI: {gas} > {max_gwei}')
-            await sleep(GAS_SLEEP_FROM, GAS_SLEEP_TO)
-        else:
-            logger.success(f"GWEI is normal | current: {gas} < {max_gwei}")
-            break
+            if gas != last_gas:
+                logger.info(f'Current GWEI: {gas} > {max_gwei}')
+            last_gas = gas
+            return False
+
+        logger.success(f"GWEI is normal | current: {gas} < {max_gwei}")
+        return True
+
+    await oracle.wait(is_gas_normal)
 
 
 def check_gas(func):
+    @functools.wraps(func)
     async def _wrapper(*args, **kwargs):
         if CHECK_GWEI:
             await wait_gas()
@@ -0,0 +1,77 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Tuple, Union
+
+from settings import GAS_CACHE_SAMPLES, GAS_CACHE_MIN_SAMPLES, GAS_CACHE_PERCENTILE, GAS_CACHE_MAX_SPREAD
+
+# (chain, contract address, function selector)
+GasKey = Tuple[str, str, str]
+
+
+class GasEstimateCache:
+    """
+    Recent gas estimates of every (chain, contract, function selector).
+
+    Once a function has enough estimates and they barely differ, a high percentile of them is used as
+    the gas limit instead of a new eth_estimateGas. New and volatile functions are estimated every time,
+    a cached limit that ran out of gas drops the samples of its function.
+    """
+
+    def __init__(self, samples: int, min_samples: int, percentile: float, max_spread: float) -> None:
+        self.samples = samples
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.max_spread = max_spread
+
+        self.hits = 0
+        self.misses = 0
+        self.out_of_gas = 0
+
+        self._estimates: Dict[GasKey, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: GasKey) -> Union[None, int]:
+        with self._lock:
+            estimates = sorted(self._estimates.get(key, ()))
+
+            if len(estimates) < self.min_samples:
+                self.misses += 1
+                return None
+
+            median = estimates[len(estimates) // 2]
+            if (estimates[-1] - estimates[0]) > median * self.max_spread:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+
+            # Nearest-rank percentile
+            rank = max(int(len(estimates) * self.percentile / 100 + 0.999999) - 1, 0)
+
+            return estimates[min(rank, len(estimates) - 1)]
+
+    def add(self, key: GasKey, estimate: int):
+        with self._lock:
+            if key not in self._estimates:
+                self._estimates[key] = deque(maxlen=self.samples)
+
+            self._estimates[key].append(estimate)
+
+    def record_out_of_gas(self, key: GasKey):
+        with self._lock:
+            self.out_of_gas += 1
+            self._estimates.pop(key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "functions": len(self._estimates),
+                "hits": self.hits,
+                "misses": self.misses,
+                "out_of_gas": self.out_of_gas,
+            }
+
+
+gas_estimate_cache = GasEstimateCache(
+    GAS_CACHE_SAMPLES, GAS_CACHE_MIN_SAMPLES, GAS_CACHE_PERCENTILE, GAS_CACHE_MAX_SPREAD
+)
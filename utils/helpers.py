@@ -1,30 +1,204 @@
-from loguru import logger
-from settings import RETRY_COUNT
-from utils.sleeping import sleep
+import asyncio
+import functools
+import random
+import re
+import threading
+import time
 import traceback
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Union
+
+from aiohttp import ClientConnectionError, ClientResponseError
+from loguru import logger
+from settings import RETRY_COUNT, RETRY_POLICY, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN
+from utils.sleeping import sleep_for
+
+# Errors that match no class keep the old behaviour: RETRY_COUNT retries after 10-20 s
+DEFAULT_POLICY = {"retries": RETRY_COUNT, "delay": 10, "max_delay": 20}
+
+# Regexes of the lowercase error messages of every class, checked in this order
+ERROR_PATTERNS = tuple(
+    (error_class, re.compile("|".join(patterns)))
+    for error_class, patterns in (
+        ("insufficient_funds", ("insufficient funds", "insufficient balance", "not enough balance", "exceeds balance")),
+        ("nonce", (
+            "nonce too low", "nonce too high", "invalid nonce", "nonce is too", "already known", "known transaction",
+            "replacement transaction underpriced"
+        )),
+        ("rate_limit", (r"\b429\b", "too many requests", "rate limit", "exceeded the quota")),
+        ("timeout", ("timed out", "timeout", r"\b50[234]\b", "server disconnected", "cannot connect")),
+        ("revert", (r"\bexecution reverted\b",)),
+    )
+)
+
+# Hashes, addresses and calldata, so the status codes above don't match digits inside them
+HEX_PATTERN = re.compile(r"0x[0-9a-f]*")
+
+# Programming and settings mistakes, they fail the same way on every attempt. KeyError, TypeError and the like
+# are left out: that's how error JSON and empty responses of the aggregator APIs fail, and those are retried.
+# So is ZeroDivisionError, it comes from zero balances and reserves that change between attempts
+CONFIG_ERRORS = (NotImplementedError,)
+
+# Transient classes that count towards opening the circuit breaker of a module
+BREAKER_CLASSES = ("rate_limit", "timeout")
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Class of the error: rate_limit, timeout (network failures included), nonce, revert,
+    insufficient_funds, config or other
+    """
+    if isinstance(error, ClientResponseError):
+        if error.status == 429:
+            return "rate_limit"
+        if error.status >= 500:
+            return "timeout"
+
+    if isinstance(error, (asyncio.TimeoutError, ClientConnectionError, ConnectionError)):
+        return "timeout"
+
+    if type(error).__name__ == "ContractLogicError":
+        return "revert"
+
+    message = HEX_PATTERN.sub("", str(error).lower())
+
+    for error_class, pattern in ERROR_PATTERNS:
+        if pattern.search(message):
+            return error_class
+
+    if isinstance(error, CONFIG_ERRORS):
+        return "config"
+
+    return "other"
+
+
+def get_retry_delay(policy: Dict, attempt: int) -> float:
+    """
+    Exponential backoff with jitter: delay * 2 ** attempt randomized up to x2, capped by max_delay
+    """
+    delay = policy.get("delay", 0) * 2 ** attempt
+
+    return min(random.uniform(delay, delay * 2), policy.get("max_delay", delay * 2))
+
+
+class CircuitBreaker:
+    """
+    Pauses a module for every wallet after a run of rate limits and timeouts in a row,
+    instead of letting all wallets keep hammering a failing API
+    """
+
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, error_class: Union[None, str]) -> bool:
+        """
+        Count the result of an attempt (None for success), True if the breaker opened
+        """
+        with self._lock:
+            if error_class not in BREAKER_CLASSES:
+                self.failures = 0
+                return False
+
+            self.failures += 1
+
+            if self.failures < self.threshold:
+                return False
+
+            self.failures = 0
+            self.open_until = time.monotonic() + self.cooldown
+
+            return True
+
+    def remaining(self) -> float:
+        return max(self.open_until - time.monotonic(), 0)
+
+
+# Retry-wrapped calls of the current wallet run that ran out of attempts, set by whoever runs the wallet
+failed_calls: ContextVar[Union[None, List[str]]] = ContextVar("failed_calls", default=None)
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_retry_stats: Dict[str, Counter] = {}
+_stats_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _stats_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN)
+
+        return _breakers[name]
+
+
+def count_retry_stat(name: str, *keys: str):
+    with _stats_lock:
+        stats = _retry_stats.setdefault(name, Counter())
+
+        for key in keys:
+            stats[key] += 1
+
+
+def get_retry_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Calls, retries, failures and errors by class of every module method
+    """
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _retry_stats.items()}
 
 
 def retry(func):
+    name = func.__qualname__
+
+    @functools.wraps(func)
     async def wrapper(*args, **kwargs):
-        retries = 0
-        while retries <= RETRY_COUNT:
+        breaker = get_breaker(name)
+        count_retry_stat(name, "calls")
+
+        attempt = 0
+        while True:
+            if breaker.remaining():
+                await sleep_for(breaker.remaining())
+
             try:
                 result = await func(*args, **kwargs)
+                breaker.record(None)
                 return result
             except Exception as e:
-                logger.error(f"Error | {e}")
-                traceback.print_exc()
-                await sleep(10, 20)
-                retries += 1
+                if hasattr(args[0] if args else None, "settle_pipelined_txs"):
+                    args[0].release_unsent()
+                    await args[0].settle_pipelined_txs()
 
-    return wrapper
+                error_class = classify_error(e)
+                policy = RETRY_POLICY.get(error_class, DEFAULT_POLICY)
+
+                count_retry_stat(name, error_class)
+                logger.error(f"Error | {error_class} | {e}")
 
+                if error_class == "other":
+                    traceback.print_exc()
 
-def remove_wallet(private_key: str):
-    with open("accounts.txt", "r") as file:
-        lines = file.readlines()
+                if breaker.record(error_class):
+                    logger.warning(f"Too many {error_class} errors in {name}, pause it for {breaker.cooldown} s.")
 
-    with open("accounts.txt", "w") as file:
-        for line in lines:
-            if private_key not in line:
-                file.write(line)
+                if attempt >= policy.get("retries", 0):
+                    count_retry_stat(name, "failed")
+
+                    failures = failed_calls.get()
+                    if failures is not None:
+                        failures.append(name)
+                    return
+
+                if error_class == "nonce" and hasattr(args[0] if args else None, "reset_nonce"):
+                    args[0].reset_nonce()
+
+                await sleep_for(get_retry_delay(policy, attempt))
+
+                attempt += 1
+                count_retry_stat(name, "retries")
+
+    return wrapper
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from typing import Dict, Tuple, Union
+from urllib.parse import urlsplit
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from settings import HTTP_POOL_SIZE, HTTP_KEEPALIVE_TIMEOUT, HTTP_TIMEOUT
+
+
+class HttpClientRegistry:
+    """
+    Long-lived aiohttp sessions for the off-chain APIs (aggregators, bridges, exchanges),
+    one per (event loop, host, proxy), so requests reuse keep-alive connections and cached DNS
+    instead of opening a new connector for every call
+    """
+
+    def __init__(self, pool_size: int, keepalive_timeout: float, timeout: float) -> None:
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+
+        self.hits = 0
+        self.misses = 0
+
+        self._sessions: Dict[Tuple[asyncio.AbstractEventLoop, str, Union[None, str]], ClientSession] = {}
+        self._lock = threading.Lock()
+
+    async def get_session(self, url: str, proxy: Union[None, str] = None) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        key = (loop, urlsplit(url).netloc, proxy or None)
+
+        with self._lock:
+            session = self._sessions.get(key)
+
+            if session is not None and not session.closed:
+                self.hits += 1
+                return session
+
+            self.misses += 1
+
+            for stale_key in [_key for _key in self._sessions if _key[0].is_closed()]:
+                del self._sessions[stale_key]
+
+            session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                ),
+                timeout=ClientTimeout(total=self.timeout),
+            )
+            self._sessions[key] = session
+
+        return session
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            sessions = [self._sessions.pop(key) for key in [_key for _key in self._sessions if _key[0] is loop]]
+
+        await asyncio.gather(*(session.close() for session in sessions if not session.closed))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "pool_size": self.pool_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+http_client = HttpClientRegistry(HTTP_POOL_SIZE, HTTP_KEEPALIVE_TIMEOUT, HTTP_TIMEOUT)
@@ -0,0 +1,55 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Set
+
+from config import COMPLETION_JOURNAL_PATH
+
+
+class CompletionJournal:
+    """
+    Append-only log of finished wallets, one "address;module;status;time" line per wallet run.
+
+    Every line is written with a single O_APPEND write and fsync under a lock,
+    so parallel wallets never interleave or lose lines.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+        self._lock = threading.Lock()
+
+    def append(self, address: str, module: str, status: str):
+        line = f"{address.lower()};{module};{status};{time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode())
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def get_completed(self, module: str, status: str = "success") -> Set[str]:
+        """
+        Addresses that finished the module with the status
+        """
+        completed = set()
+
+        if not self.path.exists():
+            return completed
+
+        with self._lock, open(self.path, "r") as file:
+            for line in file:
+                fields = line.rstrip("\n").split(";")
+
+                if len(fields) >= 3 and fields[1] == module and fields[2] == status:
+                    completed.add(fields[0])
+
+        return completed
+
+
+completion_journal = CompletionJournal(COMPLETION_JOURNAL_PATH)
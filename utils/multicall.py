@@ -0,0 +1,109 @@
+from typing import Any, List, Tuple, Union
+
+from web3 import AsyncWeb3
+from web3._utils.abi import get_abi_output_types
+from web3.contract.async_contract import AsyncContractFunction
+
+from config import MULTICALL_CONTRACTS
+
+AGGREGATE3_SELECTOR = bytes(AsyncWeb3.keccak(text="aggregate3((address,bool,bytes)[])")[:4])
+
+
+def to_bytes(data: Union[str, bytes]) -> bytes:
+    if isinstance(data, str):
+        return bytes.fromhex(data.removeprefix("0x"))
+    return bytes(data)
+
+
+def encode_aggregate3(calls: List[Tuple[str, Union[str, bytes]]], allow_failure: bool) -> bytes:
+    """
+    ABI-encode aggregate3((address,bool,bytes)[]) by hand, the generic encoder
+    is slower than the RPC round trip itself on batches of thousands of calls
+    """
+    heads, tails = [], []
+    offset = len(calls) * 32
+
+    for target, call_data in calls:
+        call_data = to_bytes(call_data)
+
+        element = b"".join([
+            to_bytes(target).rjust(32, b"\x00"),
+            int(allow_failure).to_bytes(32, "big"),
+            (96).to_bytes(32, "big"),
+            len(call_data).to_bytes(32, "big"),
+            call_data + b"\x00" * (-len(call_data) % 32),
+        ])
+
+        heads.append(offset.to_bytes(32, "big"))
+        tails.append(element)
+        offset += len(element)
+
+    return b"".join([
+        AGGREGATE3_SELECTOR,
+        (32).to_bytes(32, "big"),
+        len(calls).to_bytes(32, "big"),
+        *heads,
+        *tails,
+    ])
+
+
+def decode_aggregate3(data: bytes) -> List[Tuple[bool, bytes]]:
+    start = int.from_bytes(data[:32], "big")
+    count = int.from_bytes(data[start:start + 32], "big")
+    base = start + 32
+
+    results = []
+    for i in range(count):
+        element = base + int.from_bytes(data[base + i * 32:base + (i + 1) * 32], "big")
+
+        success = int.from_bytes(data[element:element + 32], "big") == 1
+        data_offset = element + int.from_bytes(data[element + 32:element + 64], "big")
+        length = int.from_bytes(data[data_offset:data_offset + 32], "big")
+
+        results.append((success, data[data_offset + 32:data_offset + 32 + length]))
+
+    return results
+
+
+def decode_result(w3: AsyncWeb3, call: AsyncContractFunction, success: bool, data: bytes) -> Any:
+    if not success:
+        return None
+
+    result = w3.codec.decode(get_abi_output_types(call.abi), data)
+
+    return result[0] if len(result) == 1 else result
+
+
+async def aggregate(
+        w3: AsyncWeb3, chain: str, calls: List[Tuple[str, Union[str, bytes]]], allow_failure: bool = False
+) -> List[Tuple[bool, bytes]]:
+    """
+    Run pre-encoded calls in one eth_call through Multicall3
+
+    :param calls: (target address, call data) pairs
+    :return: raw (success, return data) pairs in the order of calls
+    """
+    if not calls:
+        return []
+
+    result = await w3.eth.call({
+        "to": w3.to_checksum_address(MULTICALL_CONTRACTS[chain]),
+        "data": encode_aggregate3(calls, allow_failure),
+    })
+
+    return decode_aggregate3(bytes(result))
+
+
+async def multicall(w3: AsyncWeb3, chain: str, calls: List[AsyncContractFunction], allow_failure: bool = False) -> List:
+    """
+    Run view calls in one eth_call through Multicall3
+
+    :param calls: bound contract functions, e.g. contract.functions.balanceOf(address)
+    :param allow_failure: if True, failed calls return None instead of reverting the whole batch
+    :return: decoded outputs in the order of calls
+    """
+    results = await aggregate(
+        w3, chain, [(call.address, call._encode_transaction_data()) for call in calls], allow_failure
+    )
+
+    return [decode_result(w3, call, success, data) for call, (success, data) in zip(calls, results)]
@@ -0,0 +1,37 @@
+import threading
+from typing import Dict, Tuple, Union
+
+
+class NonceManager:
+    """
+    Keeps the next nonce of every (chain, address) locally.
+
+    The nonce is synced from the RPC once, moves forward only when a transaction was actually sent
+    and is dropped after a failed or lost transaction, so the next request syncs it again.
+    """
+
+    def __init__(self) -> None:
+        self._nonces: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, chain: str, address: str) -> Union[None, int]:
+        with self._lock:
+            return self._nonces.get((chain, address))
+
+    def sync(self, chain: str, address: str, nonce: int) -> int:
+        with self._lock:
+            nonce = max(nonce, self._nonces.get((chain, address), 0))
+            self._nonces[(chain, address)] = nonce
+
+        return nonce
+
+    def commit(self, chain: str, address: str, nonce: int) -> None:
+        with self._lock:
+            self._nonces[(chain, address)] = max(nonce + 1, self._nonces.get((chain, address), 0))
+
+    def reset(self, chain: str, address: str) -> None:
+        with self._lock:
+            self._nonces.pop((chain, address), None)
+
+
+nonce_manager = NonceManager()
@@ -7,7 +7,7 @@ from pathlib import Path
 import base64
 from hashlib import md5
 from typing import Dict
-from config import PRIVATE_KEYS_PATH, WALLETS_PATH, ENCRYPTED_DATA_PATH, PROXIES_PATH
+from config import PRIVATE_KEYS_PATH, WALLETS_PATH, ENCRYPTED_DATA_PATH, PROXIES_PATH, PASSWORD_ENV
 from settings import USE_PROXY
 
 
@@ -22,6 +22,10 @@ def get_user_password(is_keys_encrypted: bool) -> bytes:
     :param is_keys_encrypted: True if keys are encrypted
     :return: key
     """
+    password = os.environ.get(PASSWORD_ENV)
+    if password:
+        return generate_key_from_password(password)
+
     if is_keys_encrypted:
         password = getpass('Enter the password: ')
     else:
@@ -126,6 +130,8 @@ def get_wallet_data() -> Dict:
             break
         except cryptography.fernet.InvalidToken:
             print('Wrong Password')
+            if os.environ.get(PASSWORD_ENV):
+                raise ValueError(f'Wrong password in {PASSWORD_ENV}')
     else:
         raise ValueError('Wrong password')
     return wallet_data
@@ -0,0 +1,119 @@
+import asyncio
+import random
+import threading
+from typing import Any, Dict, Tuple, Union
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncWeb3
+from web3.middleware import async_geth_poa_middleware
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from config import RPC
+from settings import RPC_POOL_SIZE, RPC_KEEPALIVE_TIMEOUT, RPC_TIMEOUT
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends requests through the registry session of the running event loop,
+    so every provider on the loop shares one keep-alive connection pool
+    """
+
+    def __init__(self, endpoint_uri: str, registry: "ProviderRegistry", request_kwargs: Any = None) -> None:
+        super().__init__(endpoint_uri, request_kwargs)
+        self.registry = registry
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+
+        session = await self.registry.get_session()
+        async with session.post(self.endpoint_uri, data=request_data, **self.get_request_kwargs()) as response:
+            response.raise_for_status()
+            raw_response = await response.read()
+
+        return self.decode_rpc_response(raw_response)
+
+
+class ProviderRegistry:
+    def __init__(self, pool_size: int, keepalive_timeout: float, timeout: float) -> None:
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+
+        self.hits = 0
+        self.misses = 0
+
+        self._providers: Dict[Tuple[str, str, Union[None, str]], AsyncWeb3] = {}
+        self._sessions: Dict[asyncio.AbstractEventLoop, ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def get_w3(self, chain: str, proxy: Union[None, str] = None) -> AsyncWeb3:
+        """
+        Provider of a random RPC of the chain, picked on every call (every Account) to spread wallets
+        over the RPCs. Providers are kept per (chain, RPC, proxy) and share the session of the event loop
+        """
+        rpc = random.choice(RPC[chain]["rpc"])
+        key = (chain, rpc, proxy)
+
+        with self._lock:
+            w3 = self._providers.get(key)
+
+            if w3 is not None:
+                self.hits += 1
+                return w3
+
+            self.misses += 1
+
+            request_kwargs = {"proxy": proxy} if proxy else {}
+
+            w3 = AsyncWeb3(
+                PooledHTTPProvider(rpc, self, request_kwargs),
+                middlewares=[async_geth_poa_middleware],
+            )
+            self._providers[key] = w3
+
+        return w3
+
+    async def get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            session = self._sessions.get(loop)
+
+            if session is None or session.closed:
+                for stale_loop in [_loop for _loop in self._sessions if _loop.is_closed()]:
+                    del self._sessions[stale_loop]
+
+                session = ClientSession(
+                    connector=TCPConnector(
+                        limit=self.pool_size,
+                        keepalive_timeout=self.keepalive_timeout,
+                        ttl_dns_cache=300,
+                    ),
+                    timeout=ClientTimeout(total=self.timeout),
+                )
+                self._sessions[loop] = session
+
+        return session
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+
+        if session is not None and not session.closed:
+            await session.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "providers": len(self._providers),
+                "sessions": len(self._sessions),
+                "pool_size": self.pool_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+provider_registry = ProviderRegistry(RPC_POOL_SIZE, RPC_KEEPALIVE_TIMEOUT, RPC_TIMEOUT)
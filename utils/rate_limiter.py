@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+from settings import API_RATE_LIMITS
+
+
+class TokenBucket:
+    """
+    Token bucket of one API and key. A request reserves a token, when the bucket is empty
+    it gets the time its token refills, so waiting requests are served in arrival order
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, return how long to wait before it may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(self._tokens + (now - self._updated_at) * self.rate, self.burst)
+            self._updated_at = now
+
+            self._tokens -= 1
+
+            return max(-self._tokens / self.rate, 0)
+
+
+class RateLimiter:
+    """
+    Shared client-side limits of the off-chain APIs, one bucket per (api, key).
+    The key is the API key for keyed APIs and the proxy for the ones limited per IP
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]]) -> None:
+        self.limits = limits
+
+        self._buckets: Dict[Tuple[str, Any], TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, api: str, key: Any = None) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get((api, key))
+
+            if bucket is None:
+                bucket = TokenBucket(self.limits[api]["rate"], self.limits[api].get("burst", 1))
+                self._buckets[(api, key)] = bucket
+
+        return bucket
+
+    async def acquire(self, api: str, key: Any = None) -> float:
+        """
+        Wait for a request slot of the api, returns the time spent in the queue
+        """
+        if api not in self.limits:
+            return 0
+
+        delay = self.get_bucket(api, key).reserve()
+
+        with self._lock:
+            stats = self._stats.setdefault(
+                api, {"requests": 0, "queued": 0, "waiting": 0, "wait_total": 0.0, "wait_max": 0.0}
+            )
+            stats["requests"] += 1
+
+            if delay > 0:
+                stats["queued"] += 1
+                stats["waiting"] += 1
+                stats["wait_total"] += delay
+                stats["wait_max"] = max(stats["wait_max"], delay)
+
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                with self._lock:
+                    self._stats[api]["waiting"] -= 1
+
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                api: {
+                    "requests": stats["requests"],
+                    "queued": stats["queued"],
+                    "waiting": stats["waiting"],
+                    "wait_avg": round(stats["wait_total"] / stats["requests"], 3),
+                    "wait_max": round(stats["wait_max"], 3),
+                }
+                for api, stats in self._stats.items()
+            }
+
+
+rate_limiter = RateLimiter(API_RATE_LIMITS)
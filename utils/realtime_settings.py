@@ -0,0 +1,229 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from loguru import logger
+
+import settings
+from config import REALTIME_SETTINGS_PATH
+
+LIVE_KEYS = {
+    "MAX_GWEI": float,
+    "SLEEP_FROM": int,
+    "SLEEP_TO": int,
+    "THREAD_SLEEP_FROM": int,
+    "THREAD_SLEEP_TO": int,
+    "ASYNC_CONCURRENCY": int,
+}
+
+# (from, to) keys of the delay ranges, the from value can't be above the to value
+RANGE_KEYS = (
+    ("SLEEP_FROM", "SLEEP_TO"),
+    ("THREAD_SLEEP_FROM", "THREAD_SLEEP_TO"),
+)
+
+# Keys that must be above zero
+POSITIVE_KEYS = ("ASYNC_CONCURRENCY",)
+
+POLL_INTERVAL = 2  # Second
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+    return libc
+
+
+class RealtimeSettings:
+    """
+    In-memory snapshot of the realtime settings file.
+
+    A daemon thread reloads the file only when it changes (inotify on Linux, mtime polling elsewhere),
+    so readers never touch the disk. Keys missing from the file fall back to the default passed to get().
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+
+        self._snapshot: Dict[str, Any] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self.reload()
+
+            self._thread = threading.Thread(target=self._watch, name="realtime-settings", daemon=True)
+            self._thread.start()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._thread is None:
+            self.start()
+
+        return self._snapshot.get(key, default)
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Call back with the new snapshot after every change, from the watcher thread
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def reload(self):
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as error:
+            logger.warning(f"Can't read {self.path}, keep previous settings | {error}")
+            return
+
+        snapshot = {}
+        for key, value in data.items():
+            value_type = LIVE_KEYS.get(key)
+
+            if value_type is None:
+                continue
+
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                logger.warning(f"Realtime setting {key} must be a non-negative number, got {value!r}")
+                if key in self._snapshot:
+                    snapshot[key] = self._snapshot[key]
+                continue
+
+            snapshot[key] = value_type(value)
+
+        errors = self.validate(snapshot)
+        if errors:
+            logger.warning(f"Inconsistent realtime settings, keep previous settings | {'; '.join(errors)}")
+            return
+
+        if snapshot == self._snapshot:
+            return
+
+        changes = {key: value for key, value in snapshot.items() if self._snapshot.get(key) != value}
+        if changes:
+            logger.info(f"Realtime settings updated | {changes}")
+
+        self._snapshot = snapshot
+
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as error:
+                logger.error(f"Realtime settings listener error | {error}")
+
+    @staticmethod
+    def validate(snapshot: Dict[str, Any]) -> List[str]:
+        """
+        Errors of the snapshot, keys missing from it are checked with their values in settings.py
+        """
+        def get_value(key: str):
+            return snapshot.get(key, getattr(settings, key, None))
+
+        errors = []
+
+        for from_key, to_key in RANGE_KEYS:
+            from_value, to_value = get_value(from_key), get_value(to_key)
+
+            if from_value is not None and to_value is not None and from_value > to_value:
+                errors.append(f"{from_key} ({from_value}) is above {to_key} ({to_value})")
+
+        for key in POSITIVE_KEYS:
+            value = get_value(key)
+
+            if value is not None and value <= 0:
+                errors.append(f"{key} must be above 0, got {value}")
+
+        return errors
+
+    def _watch(self):
+        libc = load_inotify()
+
+        if libc is not None:
+            try:
+                self._watch_inotify(libc)
+                return
+            except OSError as error:
+                logger.debug(f"inotify is not available, fall back to polling | {error}")
+
+        self._watch_polling()
+
+    def _watch_inotify(self, libc):
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # Watch the directory: editors often replace the file instead of writing into it
+        directory, file_name = os.path.split(self.path)
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+        if libc.inotify_add_watch(fd, directory.encode(), mask) < 0:
+            os.close(fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+        # Catch up with changes made before the watch was added
+        self.reload()
+
+        while True:
+            buffer = os.read(fd, 4096)
+
+            offset, changed = 0, False
+            while offset < len(buffer):
+                _, _, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+
+                changed |= name.decode(errors="ignore") == file_name
+                offset += EVENT_HEADER.size + length
+
+            if changed:
+                self.reload()
+
+    def _watch_polling(self):
+        last_mtime = self._get_mtime()
+        self.reload()
+
+        while True:
+            time.sleep(POLL_INTERVAL)
+
+            mtime = self._get_mtime()
+            if mtime != last_mtime:
+                last_mtime = mtime
+                self.reload()
+
+    def _get_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+
+realtime_settings = RealtimeSettings(REALTIME_SETTINGS_PATH)
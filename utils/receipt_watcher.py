@@ -0,0 +1,122 @@
+import asyncio
+import random
+import threading
+from typing import Dict, Tuple, Union
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from utils.providers import provider_registry
+
+POLL_INTERVAL = 1  # Second
+MAX_POLL_INTERVAL = 30  # Second
+MAX_BLOCKS_BEHIND = 20
+
+
+def backoff(delay: float) -> float:
+    return min(delay * 2, MAX_POLL_INTERVAL) * random.uniform(0.8, 1.2)
+
+
+class ReceiptWatcher:
+    """
+    Polls new blocks of one chain and resolves the future of every watched transaction
+    as soon as it shows up in a block. One poller serves all wallets of the proxy on the event loop,
+    so block polling goes through the same proxy as the wallets' own requests.
+
+    Waiters of the same transaction share its future, it is dropped when the last of them unwatches.
+    """
+
+    def __init__(self, chain: str, proxy: Union[None, str] = None) -> None:
+        self.chain = chain
+        self.w3 = provider_registry.get_w3(chain, proxy)
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[str, int] = {}
+        self._task = None
+        self._last_block = None
+
+    def watch(self, tx_hash: str) -> asyncio.Future:
+        tx_hash = AsyncWeb3.to_hex(hexstr=tx_hash)
+
+        future = self._pending.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[tx_hash] = future
+
+        self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+
+        return future
+
+    def unwatch(self, tx_hash: str):
+        tx_hash = AsyncWeb3.to_hex(hexstr=tx_hash)
+
+        waiters = self._waiters.get(tx_hash, 0) - 1
+
+        if waiters > 0:
+            self._waiters[tx_hash] = waiters
+        else:
+            self._waiters.pop(tx_hash, None)
+            self._pending.pop(tx_hash, None)
+
+    def _has_unresolved(self) -> bool:
+        return any(not future.done() for future in self._pending.values())
+
+    async def _poll(self):
+        delay = POLL_INTERVAL
+
+        while self._has_unresolved():
+            try:
+                block_number = await self.w3.eth.block_number
+
+                if self._last_block is None:
+                    self._last_block = block_number - 1
+
+                if block_number > self._last_block:
+                    first_block = max(self._last_block + 1, block_number - MAX_BLOCKS_BEHIND)
+
+                    for number in range(first_block, block_number + 1):
+                        await self._process_block(number)
+
+                    self._last_block = block_number
+                    delay = POLL_INTERVAL
+                else:
+                    delay = backoff(delay)
+            except Exception as error:
+                logger.debug(f"Receipt watcher {self.chain} error | {error}")
+                delay = backoff(delay)
+
+            await asyncio.sleep(delay)
+
+        self._last_block = None
+
+    async def _process_block(self, number: int):
+        block = await self.w3.eth.get_block(number)
+
+        for tx_hash in block["transactions"]:
+            future = self._pending.get(AsyncWeb3.to_hex(tx_hash))
+
+            if future is not None and not future.done():
+                future.set_result(number)
+
+
+_watchers: Dict[Tuple[str, Union[None, str], asyncio.AbstractEventLoop], ReceiptWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def get_receipt_watcher(chain: str, proxy: Union[None, str] = None) -> ReceiptWatcher:
+    loop = asyncio.get_running_loop()
+
+    with _watchers_lock:
+        watcher = _watchers.get((chain, proxy, loop))
+
+        if watcher is None:
+            for key in [key for key in _watchers if key[2].is_closed()]:
+                del _watchers[key]
+
+            watcher = ReceiptWatcher(chain, proxy)
+            _watchers[(chain, proxy, loop)] = watcher
+
+    return watcher
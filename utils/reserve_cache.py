@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Tuple, Union
+
+from web3 import AsyncWeb3
+from web3.contract.async_contract import AsyncContractFunction
+
+from config import MULTICALL_CONTRACTS
+from settings import RESERVE_SNAPSHOT_TTL
+from utils.multicall import aggregate, decode_result
+
+GET_BLOCK_NUMBER_SELECTOR = bytes(AsyncWeb3.keccak(text="getBlockNumber()")[:4])
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee: int, precision: int = 10000) -> int:
+    """
+    Output of a constant product (x * y = k) pool, fee in 1 / precision of the input (basis points by default)
+    """
+    amount_in_with_fee = amount_in * (precision - fee)
+
+    return amount_in_with_fee * reserve_out // (reserve_in * precision + amount_in_with_fee)
+
+
+class ReserveCache:
+    """
+    Snapshot of the pool states (reserves and the like) wallets quote on, shared by every wallet.
+
+    A pool is registered with its view calls on first use. A snapshot older than RESERVE_SNAPSHOT_TTL
+    (about one block) is refreshed for all registered pools at once with one multicall, which also
+    returns the block number, so quotes cost one eth_call per block instead of one per wallet.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+        self.hits = 0
+        self.refreshes = 0
+
+        self._calls: Dict[str, Dict[Hashable, List[AsyncContractFunction]]] = {}
+        self._snapshots: Dict[str, Tuple[float, int, Dict[Hashable, Union[None, List[Any]]]]] = {}
+        self._refresh_locks: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _get_fresh(self, chain: str, key: Hashable) -> Tuple[bool, Union[None, List[Any]]]:
+        snapshot = self._snapshots.get(chain)
+
+        if snapshot is None or time.monotonic() - snapshot[0] > self.ttl or key not in snapshot[2]:
+            return False, None
+
+        return True, snapshot[2][key]
+
+    def _get_refresh_lock(self, chain: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            for stale_key in [_key for _key in self._refresh_locks if _key[0].is_closed()]:
+                del self._refresh_locks[stale_key]
+
+            return self._refresh_locks.setdefault((loop, chain), asyncio.Lock())
+
+    async def get(
+            self, w3: AsyncWeb3, chain: str, key: Hashable, calls: List[AsyncContractFunction]
+    ) -> Union[None, List[Any]]:
+        """
+        Results of the calls of the pool from the current snapshot, None if any of them failed
+        """
+        with self._lock:
+            self._calls.setdefault(chain, {}).setdefault(key, calls)
+
+            fresh, results = self._get_fresh(chain, key)
+            if fresh:
+                self.hits += 1
+                return results
+
+        # Wallets asking at the same time wait for one refresh
+        async with self._get_refresh_lock(chain):
+            with self._lock:
+                fresh, results = self._get_fresh(chain, key)
+                if fresh:
+                    self.hits += 1
+                    return results
+
+            await self.refresh(w3, chain)
+
+        with self._lock:
+            return self._snapshots[chain][2].get(key)
+
+    async def refresh(self, w3: AsyncWeb3, chain: str):
+        with self._lock:
+            pools = list(self._calls.get(chain, {}).items())
+
+        raw_calls = [(MULTICALL_CONTRACTS[chain], GET_BLOCK_NUMBER_SELECTOR)]
+        for _, calls in pools:
+            raw_calls.extend((call.address, call._encode_transaction_data()) for call in calls)
+
+        fetched_at = time.monotonic()
+        results = await aggregate(w3, chain, raw_calls, allow_failure=True)
+
+        block_number = int.from_bytes(results[0][1], "big")
+
+        states, position = {}, 1
+        for key, calls in pools:
+            decoded = [
+                decode_result(w3, call, success, data)
+                for call, (success, data) in zip(calls, results[position:position + len(calls)])
+            ]
+            position += len(calls)
+
+            states[key] = None if any(result is None for result in decoded) else decoded
+
+        with self._lock:
+            self._snapshots[chain] = (fetched_at, block_number, states)
+            self.refreshes += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pools": sum(len(calls) for calls in self._calls.values()),
+                "blocks": {chain: snapshot[1] for chain, snapshot in self._snapshots.items()},
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+            }
+
+
+reserve_cache = ReserveCache(RESERVE_SNAPSHOT_TTL)
@@ -0,0 +1,157 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+from loguru import logger
+
+from utils.concurrency import DynamicSemaphore
+from utils.sleeping import wallet_timer
+
+METRICS_INTERVAL = 300  # Second
+
+Step = Callable[[], Awaitable[Any]]
+
+
+class Scheduler:
+    """
+    Time ordered queue of (next_run_at, wallet, step) entries for all wallets.
+
+    Due steps run on at most get_limit() worker tasks, counted by a DynamicSemaphore so the limit
+    can change while the queue runs. A wallet waiting for its next step is only a queue entry,
+    not a sleeping coroutine. A step continues its wallet by scheduling the next step with
+    schedule_after(), the wallet is done when it has no queued or running steps left.
+    """
+
+    def __init__(self, get_limit: Callable[[], int]) -> None:
+        self.slots = DynamicSemaphore(get_limit)
+
+        self._queue: List[Tuple[float, int, Any, Step, contextvars.Context, float]] = []
+        self._seq = itertools.count()
+        self._outstanding: Dict[Any, int] = {}
+        self._done_callbacks: Dict[Any, List[Callable[[], None]]] = {}
+        self._wakeup = None
+        self._tasks = set()
+
+        self._dispatched = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+
+    def schedule(self, run_at: float, wallet: Any, step: Step):
+        """
+        Queue step of the wallet to run at run_at (time.time()), with the context of the caller
+        """
+        heapq.heappush(
+            self._queue, (run_at, next(self._seq), wallet, step, contextvars.copy_context(), time.time())
+        )
+        self._outstanding[wallet] = self._outstanding.get(wallet, 0) + 1
+
+        self.wake()
+
+    def schedule_after(self, delay: float, step: Step):
+        """
+        Continue the wallet of the running step after delay seconds
+        """
+        self.schedule(time.time() + delay, current_wallet.get(), step)
+
+    def add_done_callback(self, callback: Callable[[], None]):
+        """
+        Call back when the wallet of the running step has nothing queued or running any more
+        """
+        self._done_callbacks.setdefault(current_wallet.get(), []).append(callback)
+
+    def wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        now = time.time()
+
+        return {
+            "queued": len(self._queue),
+            "due": sum(1 for entry in self._queue if entry[0] <= now),
+            "running": self.slots.active,
+            "wallets": len(self._outstanding),
+            "dispatched": self._dispatched,
+            "lag_avg": round(self._lag_total / self._dispatched, 3) if self._dispatched else 0,
+            "lag_max": round(self._lag_max, 3),
+            "head_lag": round(max(now - self._queue[0][0], 0), 3) if self._queue else 0,
+        }
+
+    async def run(self):
+        """
+        Dispatch due steps until the queue is empty and nothing is running
+        """
+        self._wakeup = asyncio.Event()
+        next_metrics = time.monotonic() + METRICS_INTERVAL
+
+        while self._queue or self.slots.active:
+            self._wakeup.clear()
+
+            now = time.time()
+            while self._queue and self._queue[0][0] <= now and self.slots.try_acquire():
+                self._dispatch(heapq.heappop(self._queue), now)
+
+            if time.monotonic() >= next_metrics:
+                logger.info(f"Scheduler stats: {self.stats()}")
+                next_metrics = time.monotonic() + METRICS_INTERVAL
+
+            timeout = None
+            if self._queue and self.slots.has_slot():
+                timeout = max(self._queue[0][0] - time.time(), 0)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, entry, now: float):
+        run_at, _, wallet, step, context, scheduled_at = entry
+
+        lag = max(now - run_at, 0)
+        self._dispatched += 1
+        self._lag_total += lag
+        self._lag_max = max(self._lag_max, lag)
+
+        task = context.run(asyncio.create_task, self._run_step(wallet, step, now - scheduled_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_step(self, wallet, step: Step, waited: float):
+        current_wallet.set(wallet)
+        current_scheduler.set(self)
+
+        timer = wallet_timer.get()
+        if timer is not None:
+            timer.slept += waited
+
+        try:
+            await step()
+        except Exception as error:
+            logger.error(error)
+        finally:
+            await self.slots.release()
+            self._finish(wallet)
+            self.wake()
+
+    def _finish(self, wallet):
+        self._outstanding[wallet] -= 1
+
+        if self._outstanding[wallet] > 0:
+            return
+
+        del self._outstanding[wallet]
+
+        for callback in self._done_callbacks.pop(wallet, []):
+            try:
+                callback()
+            except Exception as error:
+                logger.error(error)
+
+
+current_scheduler: contextvars.ContextVar[Union[None, Scheduler]] = contextvars.ContextVar(
+    "current_scheduler", default=None
+)
+current_wallet: contextvars.ContextVar[Any] = contextvars.ContextVar("current_wallet", default=None)
@@ -1,12 +1,127 @@
 import asyncio
 import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Tuple, Union
 
 from loguru import logger
 
 
+class WalletTimer:
+    """
+    Wall-clock time of one wallet run, split into sleeping and working
+    """
+
+    def __init__(self, account_id: int) -> None:
+        self.account_id = account_id
+        self.started = time.monotonic()
+        self.slept = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def worked(self) -> float:
+        return self.elapsed - self.slept
+
+
+wallet_timer: ContextVar[Union[None, WalletTimer]] = ContextVar("wallet_timer", default=None)
+
+_sleepers: Dict[asyncio.Future, asyncio.AbstractEventLoop] = {}
+_sleepers_lock = threading.Lock()
+
+_totals = {"wallets": 0, "slept": 0.0, "worked": 0.0}
+_totals_lock = threading.Lock()
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _cancel(future: asyncio.Future):
+    if not future.done():
+        future.cancel()
+
+
 async def sleep(sleep_from: int, sleep_to: int):
-    delay = random.randint(sleep_from, sleep_to)
+    await sleep_for(random.randint(sleep_from, sleep_to))
+
+
+async def sleep_for(delay: float):
+    logger.info(f"💤 Sleep {round(delay)} s.")
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    handle = loop.call_later(delay, _wake, future)
+
+    with _sleepers_lock:
+        _sleepers[future] = loop
+
+    start_time = time.monotonic()
+    try:
+        await future
+    finally:
+        handle.cancel()
+
+        with _sleepers_lock:
+            _sleepers.pop(future, None)
+
+        timer = wallet_timer.get()
+        if timer is not None:
+            timer.slept += time.monotonic() - start_time
+
+
+def _notify_sleepers(callback) -> int:
+    with _sleepers_lock:
+        sleepers = list(_sleepers.items())
+
+    for future, loop in sleepers:
+        try:
+            loop.call_soon_threadsafe(callback, future)
+        except RuntimeError:
+            pass
+
+    return len(sleepers)
+
+
+def skip_sleeps():
+    """
+    Wake up every pending sleep, the wallets continue right away
+    """
+    logger.info(f"Skip {_notify_sleepers(_wake)} pending sleeps")
+
+
+def cancel_sleeps():
+    """
+    Cancel every pending sleep on shutdown, the sleeping wallets get CancelledError
+    """
+    _notify_sleepers(_cancel)
+
+
+def start_wallet_timer(account_id: int) -> WalletTimer:
+    timer = WalletTimer(account_id)
+    wallet_timer.set(timer)
+
+    return timer
+
+
+def finish_wallet_timer(timer: WalletTimer):
+    elapsed, slept = timer.elapsed, timer.slept
+
+    with _totals_lock:
+        _totals["wallets"] += 1
+        _totals["slept"] += slept
+        _totals["worked"] += elapsed - slept
+
+    logger.info(
+        f"[{timer.account_id}] Wallet finished in {round(elapsed)} s. | "
+        f"working {round(elapsed - slept)} s., sleeping {round(slept)} s."
+    )
+
 
-    logger.info(f"💤 Sleep {delay} s.")
-    for _ in range(delay):
-        await asyncio.sleep(1)
+def get_timers_summary() -> Tuple[int, float, float]:
+    with _totals_lock:
+        return _totals["wallets"], _totals["worked"], _totals["slept"]
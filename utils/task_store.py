@@ -0,0 +1,181 @@
+import json
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+from config import TASK_STORE_PATH
+
+FINISHED_STEPS = ("done", "skipped", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    address TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',
+    created_at REAL NOT NULL,
+    next_run_at REAL NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS routes_active ON routes (address, kind, status);
+
+CREATE TABLE IF NOT EXISTS steps (
+    route_id INTEGER NOT NULL REFERENCES routes (id),
+    position INTEGER NOT NULL,
+    module TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    tx_hashes TEXT NOT NULL DEFAULT '[]',
+    started_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (route_id, position)
+);
+"""
+
+# (route id, step position) of the step running in the current task, send_raw_transaction reports to it
+current_step: ContextVar[Union[None, Tuple[int, int]]] = ContextVar("current_step", default=None)
+
+
+class TaskStore:
+    """
+    Durable state of the routes in a sqlite file: the planned steps of every wallet,
+    their status, the transaction hashes they sent and when the next step is due.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+        return self._connection
+
+    def _execute(self, query: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(query, params).fetchall()
+
+    def get_active_route(self, address: str, kind: str, fingerprint: str) -> Union[None, Dict]:
+        """
+        Unfinished route of the wallet, a route planned from other settings is abandoned
+        """
+        rows = self._execute(
+            "SELECT id, fingerprint, next_run_at FROM routes WHERE address = ? AND kind = ? AND status = 'running' "
+            "ORDER BY id DESC",
+            (address, kind)
+        )
+
+        route = None
+        for row in rows:
+            if route is None and row["fingerprint"] == fingerprint:
+                route = {"id": row["id"], "next_run_at": row["next_run_at"]}
+            else:
+                self._execute("UPDATE routes SET status = 'abandoned' WHERE id = ?", (row["id"],))
+
+        if route is not None:
+            route["steps"] = [
+                {
+                    "position": step["position"],
+                    "module": step["module"],
+                    "status": step["status"],
+                    "tx_hashes": json.loads(step["tx_hashes"]),
+                }
+                for step in self._execute(
+                    "SELECT position, module, status, tx_hashes FROM steps WHERE route_id = ? ORDER BY position",
+                    (route["id"],)
+                )
+            ]
+
+        return route
+
+    def create_route(self, address: str, kind: str, fingerprint: str, modules: List[Union[None, str]]) -> Dict:
+        with self._lock:
+            connection = self._connect()
+
+            connection.execute("BEGIN")
+            try:
+                route_id = connection.execute(
+                    "INSERT INTO routes (address, kind, fingerprint, created_at) VALUES (?, ?, ?, ?)",
+                    (address, kind, fingerprint, time.time())
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO steps (route_id, position, module) VALUES (?, ?, ?)",
+                    [(route_id, position, module) for position, module in enumerate(modules)]
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        return {
+            "id": route_id,
+            "next_run_at": 0,
+            "steps": [
+                {"position": position, "module": module, "status": "pending", "tx_hashes": []}
+                for position, module in enumerate(modules)
+            ],
+        }
+
+    def start_step(self, route_id: int, position: int):
+        self._execute(
+            "UPDATE steps SET status = 'running', started_at = ? WHERE route_id = ? AND position = ?",
+            (time.time(), route_id, position)
+        )
+
+    def finish_step(self, route_id: int, position: int, status: str):
+        self._execute(
+            "UPDATE steps SET status = ?, finished_at = ? WHERE route_id = ? AND position = ?",
+            (status, time.time(), route_id, position)
+        )
+
+    def get_tx_hashes(self, route_id: int, position: int) -> List[str]:
+        rows = self._execute(
+            "SELECT tx_hashes FROM steps WHERE route_id = ? AND position = ?", (route_id, position)
+        )
+
+        return json.loads(rows[0]["tx_hashes"]) if rows else []
+
+    def add_tx_hash(self, route_id: int, position: int, tx_hash: str):
+        self._execute(
+            "UPDATE steps SET tx_hashes = json_insert(tx_hashes, '$[#]', ?) WHERE route_id = ? AND position = ?",
+            (tx_hash, route_id, position)
+        )
+
+    def set_next_run(self, route_id: int, next_run_at: float):
+        self._execute("UPDATE routes SET next_run_at = ? WHERE id = ?", (next_run_at, route_id))
+
+    def finish_route(self, route_id: int):
+        self._execute("UPDATE routes SET status = 'done' WHERE id = ?", (route_id,))
+
+
+task_store = TaskStore(TASK_STORE_PATH)
+
+
+def record_tx_hash(tx_hash: Union[str, bytes], chain: str):
+    step = current_step.get()
+
+    if step is not None:
+        if isinstance(tx_hash, bytes):
+            tx_hash = "0x" + tx_hash.hex().removeprefix("0x")
+
+        task_store.add_tx_hash(*step, f"{chain}:{tx_hash}")
+
+
+def split_tx_hash(entry: str) -> Tuple[str, str]:
+    """
+    (chain, hash) of a recorded transaction, hashes recorded without the chain are zkSync ones
+    """
+    chain, _, tx_hash = entry.rpartition(":")
+
+    return chain or "zksync", tx_hash